@@ -98,7 +98,32 @@ import operator
 import hashlib
 import datetime
 import os
+import bisect
+import collections
+import struct
+import zlib
+import sys
+import types
+import marshal
+import pickle
+import subprocess
+import threading
+import queue
 import urllib.request, urllib.error, urllib.parse
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    # Before Python 3.8, each instance keeps its cache to itself:
+    shared_memory = None
+
+try:
+    import fcntl
+except ImportError:
+    # Without file locks (as on Windows), a compaction may lose lines that
+    # other instances append at the same moment:
+    fcntl = None
+
 def get_server_address():
     # Should be 'https://catagolue.hatsya.com' for the released version,
     # and 'https://localhost:8080' for the development version:    
@@ -399,11 +424,194 @@ def hashsoup(instring, sym):
     return thesoup
 
 
+# Ashes are censused in pages of similarly-sized ashes. These are the
+# largest bounding-box dimensions of tiny and medium ashes; anything
+# larger is huge:
+ashsizeclasses = [32, 256]
+
+# Extra empty cells left around each ash of a given size class, on top of
+# the 2^stepsize cells needed by CoalesceObjects:
+ashpadding = [64, 256, 500]
+
+# Returns the size class (0, 1 or 2) of an ash with the given rect:
+def ash_size_class(rect):
+
+    sizeclass = 0
+    while ((sizeclass < len(ashsizeclasses)) and (max(rect[2], rect[3]) > ashsizeclasses[sizeclass])):
+        sizeclass += 1
+
+    return sizeclass
+
+# The eight rotations and reflections of the plane, as matrices (a, b, c, d)
+# which send (x, y) to (a*x + b*y, c*x + d*y):
+orientations = [(1, 0, 0, 1), (-1, 0, 0, 1), (1, 0, 0, -1), (-1, 0, 0, -1),
+                (0, 1, 1, 0), (0, -1, 1, 0), (0, 1, -1, 0), (0, -1, -1, 0)]
+
+# Bounding boxes of more than this many cells would make the bitmaps of
+# shape_key() slow to build (each cell copies the whole bitmap):
+maxbitmaparea = 65536
+
+# Returns a key which identifies a cell list up to translation, rotation
+# and reflection. The key is the least (width, height, bitmap) over all
+# eight orientations, where the bitmap packs the cells into an integer one
+# row at a time. Above maxbitmaparea, the cells' positions in the bitmap
+# are sorted instead, and the key holds an MD5 digest of the least list of
+# them in place of the bitmap. The two kinds of key never clash, since
+# they are for boxes of different dimensions.
+def shape_key(livecells, left, top, width, height):
+
+    if (width * height > maxbitmaparea):
+        return large_shape_key(livecells, left, top, width, height)
+
+    shapekey = None
+
+    for (a, b, c, d) in orientations:
+
+        # Dimensions of the transformed bounding box:
+        if (a == 0):
+            tw, th = height, width
+        else:
+            tw, th = width, height
+
+        # Offsets which move the transformed cells back into the box:
+        ox = (tw - 1) if (a + b < 0) else 0
+        oy = (th - 1) if (c + d < 0) else 0
+
+        bitmap = 0
+        for i in range(0, len(livecells), 2):
+            x = livecells[i] - left
+            y = livecells[i+1] - top
+            bitmap |= 1 << ((ox + a*x + b*y) + tw * (oy + c*x + d*y))
+
+        if ((shapekey is None) or ((tw, th, bitmap) < shapekey)):
+            shapekey = (tw, th, bitmap)
+
+    return shapekey
+
+def large_shape_key(livecells, left, top, width, height):
+
+    least = None
+
+    for (a, b, c, d) in orientations:
+
+        if (a == 0):
+            tw, th = height, width
+        else:
+            tw, th = width, height
+
+        ox = (tw - 1) if (a + b < 0) else 0
+        oy = (th - 1) if (c + d < 0) else 0
+
+        positions = []
+        for i in range(0, len(livecells), 2):
+            x = livecells[i] - left
+            y = livecells[i+1] - top
+            positions.append((ox + a*x + b*y) + tw * (oy + c*x + d*y))
+        positions.sort()
+
+        if ((least is None) or ((tw, th, positions) < least)):
+            least = (tw, th, positions)
+
+    (tw, th, positions) = least
+    digest = hashlib.md5(",".join([str(p) for p in positions]).encode('utf-8')).hexdigest()
+
+    return (tw, th, int(digest, 16))
+
+# Returns a signature for an infinite-growth pattern, from the shape key of
+# its initial cells (so independent of position and orientation) and its
+# populations over the first few generations:
+def growth_signature(shapekey, populations, generations=16):
+
+    prehash = "%d %d %x" % shapekey + "#" + ",".join([str(p) for p in populations[:generations]])
+
+    return hashlib.md5(prehash.encode('utf-8')).hexdigest()
 
+# Returns the key of a line of the on-disk cache (its record type and all
+# of its fields except the value), or None if the line is incomplete or
+# isn't a record:
+def cache_line_key(line):
 
-# Obtains a canonical representation of any oscillator/spaceship that (in
-# some phase) fits within a 40-by-40 bounding box. This representation is
-# alphanumeric and lowercase, and so much more compact than RLE. Compare:
+    fields = line.split()
+    if ((len(fields) < 3) or (line[-1] != "\n")):
+        return None
+
+    if ((fields[0] == "c") and (len(fields) == 5)):
+        return " ".join(fields[:4])
+    elif (fields[0] in ["d", "g", "i"]):
+        return fields[0] + " " + fields[1]
+    elif (fields[0] in ["s", "p"]):
+        return fields[0]
+
+    return None
+
+# Packs a page of ashes into the universe by shelf bin-packing. Each ash
+# occupies a slot the size of its own bounding box plus a margin on every
+# side, so one large ash no longer inflates the spacing of the whole page.
+#
+# @param ashes   a list of [soupid, celllist, rect, stepsize] lists
+# @param margin  the number of empty cells to leave around each ash
+#
+# Returns a list of (dx, dy) offsets at which to draw each ash, together
+# with a placement index for use by locate_soup().
+def pack_ashes(ashes, margin):
+
+    # Place the tallest ashes first, so that the shelves are well-filled:
+    order = sorted(range(len(ashes)), key=lambda i: (-ashes[i][2][3], ashes[i][0]))
+
+    totalarea = 0
+    shelfwidth = 0
+    for ash in ashes:
+        rect = ash[2]
+        totalarea += (rect[2] + 2*margin) * (rect[3] + 2*margin)
+        shelfwidth = max(shelfwidth, rect[2] + 2*margin)
+
+    # Aim for a roughly square page:
+    shelfwidth = max(shelfwidth, int(math.sqrt(totalarea)))
+
+    offsets = [(0, 0)] * len(ashes)
+    shelftops = []
+    shelves = []
+    sx = 0
+    sy = 0
+    sheight = 0
+
+    for i in order:
+
+        soupid = ashes[i][0]
+        rect = ashes[i][2]
+        slotwidth = rect[2] + 2*margin
+        slotheight = rect[3] + 2*margin
+
+        if ((len(shelves) == 0) | (sx + slotwidth > shelfwidth)):
+            # Start a new shelf beneath the previous one:
+            sy += sheight
+            sx = 0
+            sheight = slotheight
+            shelftops.append(sy)
+            shelves.append(([], []))
+
+        # Translate the ash so that its bounding box sits inside the margin:
+        offsets[i] = (sx + margin - rect[0], sy + margin - rect[1])
+        shelves[-1][0].append(sx)
+        shelves[-1][1].append(soupid)
+        sx += slotwidth
+
+    return offsets, (shelftops, shelves)
+
+# Returns the id of the soup whose slot contains the cell (x, y):
+def locate_soup(placement, x, y):
+
+    shelftops, shelves = placement
+    lefts, soupids = shelves[max(0, bisect.bisect_right(shelftops, y) - 1)]
+
+    return soupids[max(0, bisect.bisect_right(lefts, x) - 1)]
+
+
+
+
+# Obtains a canonical representation of any oscillator/spaceship. This
+# representation is alphanumeric and lowercase, and so much more compact
+# than RLE. Compare:
 #
 # Common name: pentadecathlon
 # Canonical representation: 4r4z4r4
@@ -412,64 +620,71 @@ def hashsoup(instring, sym):
 # It is a generalisation of a notation created by Allan Weschler in 1992.
 def canonise(duration):
 
-    representation = "#"
+    # Each phase is fetched from the universe once:
+    phases = []
 
-    # We need to compare each phase to find the one with the smallest
-    # description:
     for t in range(duration):
 
         rect = g.getrect()
         if (len(rect) == 0):
             return "0"
 
-        if ((rect[2] <= 40) & (rect[3] <= 40)):
-            # Fits within a 40-by-40 bounding box, so eligible to be canonised.
-            # Choose the orientation which results in the smallest description:
-            representation = compare_representations(representation, canonise_orientation(rect[2], rect[3], rect[0], rect[1], 1, 0, 0, 1))
-            representation = compare_representations(representation, canonise_orientation(rect[2], rect[3], rect[0]+rect[2]-1, rect[1], -1, 0, 0, 1))
-            representation = compare_representations(representation, canonise_orientation(rect[2], rect[3], rect[0], rect[1]+rect[3]-1, 1, 0, 0, -1))
-            representation = compare_representations(representation, canonise_orientation(rect[2], rect[3], rect[0]+rect[2]-1, rect[1]+rect[3]-1, -1, 0, 0, -1))
-            representation = compare_representations(representation, canonise_orientation(rect[3], rect[2], rect[0], rect[1], 0, 1, 1, 0))
-            representation = compare_representations(representation, canonise_orientation(rect[3], rect[2], rect[0]+rect[2]-1, rect[1], 0, -1, 1, 0))
-            representation = compare_representations(representation, canonise_orientation(rect[3], rect[2], rect[0], rect[1]+rect[3]-1, 0, 1, -1, 0))
-            representation = compare_representations(representation, canonise_orientation(rect[3], rect[2], rect[0]+rect[2]-1, rect[1]+rect[3]-1, 0, -1, -1, 0))
+        phases.append(g.getcells(rect))
 
         g.run(1)
 
-    return representation
+    return canonise_cells(phases)
 
-# A subroutine used by canonise:
-def canonise_orientation(length, breadth, ox, oy, a, b, c, d):
+# Canonises an object given as a list of its phases (each a non-empty cell
+# list), without using Golly. This returns the same representation as
+# canonise(), or "#" if there are no phases.
+#
+# Only phases which fit within a 40-by-40 bounding box are eligible to be
+# canonised, as they always have been. Objects which are larger than this
+# in every phase are canonised in their best phase of any size, so that
+# they can be named and cached like everything else.
+def canonise_cells(phases):
 
-    representation = ""
+    representation = "#"
 
-    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+    rects = [list_rect(celllist) for celllist in phases]
+
+    eligible = [i for i in range(len(phases)) if ((rects[i][2] <= 40) & (rects[i][3] <= 40))]
+    if (len(eligible) == 0):
+        eligible = range(len(phases))
+
+    for i in eligible:
+
+        xs = phases[i][0::2]
+        ys = phases[i][1::2]
+        rect = rects[i]
+
+        # Choose the orientation which results in the smallest description:
+        for (length, breadth, ox, oy, a, b, c, d) in [
+                (rect[2], rect[3], rect[0], rect[1], 1, 0, 0, 1),
+                (rect[2], rect[3], rect[0]+rect[2]-1, rect[1], -1, 0, 0, 1),
+                (rect[2], rect[3], rect[0], rect[1]+rect[3]-1, 1, 0, 0, -1),
+                (rect[2], rect[3], rect[0]+rect[2]-1, rect[1]+rect[3]-1, -1, 0, 0, -1),
+                (rect[3], rect[2], rect[0], rect[1], 0, 1, 1, 0),
+                (rect[3], rect[2], rect[0]+rect[2]-1, rect[1], 0, -1, 1, 0),
+                (rect[3], rect[2], rect[0], rect[1]+rect[3]-1, 0, 1, -1, 0),
+                (rect[3], rect[2], rect[0]+rect[2]-1, rect[1]+rect[3]-1, 0, -1, -1, 0)]:
+
+            # Each orientation matrix is its own inverse transposed, which
+            # gives the column u and row r of each cell in the oriented box.
+            # Rows are packed into strips of five, one digit per column:
+            strips = [[0] * length for v in range(int((breadth-1)/5)+1)]
+            for j in range(0, len(xs)):
+                u = a*(xs[j] - ox) + c*(ys[j] - oy)
+                r = b*(xs[j] - ox) + d*(ys[j] - oy)
+                strips[r // 5][u] |= 1 << (r % 5)
+
+            # An orientation is abandoned once it is longer than the best:
+            limit = len(representation) if (representation != "#") else None
+            orientation = wechsler_strips(strips, limit)
+            if orientation is not None:
+                representation = compare_representations(representation, orientation)
 
-    for v in range(int((breadth-1)/5)+1):
-        zeroes = 0
-        if (v != 0):
-            representation += "z"
-        for u in range(length):
-            baudot = 0
-            for w in range(5):
-                x = ox + a*u + b*(5*v + w)
-                y = oy + c*u + d*(5*v + w)
-                baudot = (baudot >> 1) + 16*g.getcell(x, y)
-            if (baudot == 0):
-                zeroes += 1
-            else:
-                if (zeroes > 0):
-                    if (zeroes == 1):
-                        representation += "0"
-                    elif (zeroes == 2):
-                        representation += "w"
-                    elif (zeroes == 3):
-                        representation += "x"
-                    else:
-                        representation += "y"
-                        representation += chars[zeroes - 4]
-                zeroes = 0
-                representation += chars[baudot]
     return representation
 
 # Compares strings first by length, then by lexicographical ordering.
@@ -513,8 +728,36 @@ def regress(pairlist):
 
     return (cumcov / cumvar)
 
+# Classifies the exponent of a power-law growth pattern:
+def power_class(power):
+
+    if (power < 1.10):
+        return "unidentified"
+    elif (power < 1.65):
+        return "zz_REPLICATOR"
+    elif (power < 2.05):
+        return "zz_LINEAR"
+    elif (power < 2.8):
+        return "zz_EXPLOSIVE"
+    else:
+        return "zz_QUADRATIC"
+
 # Analyses a pattern whose average population follows a power-law:
-def powerlyse(stepsize, numsteps):
+#
+# If the total of the populations over the first t steps grows like t^k,
+# the total over the steps (t, 2t] is 2^k times that over (t/2, t]. So each
+# pair of adjacent windows, whose lengths double, gives an estimate of k
+# from the populations within them alone. The analysis stops early once
+# the estimates from the last few disjoint windows all lie in the range of
+# one class; growth which changes pace within those windows usually makes
+# them disagree. A change after the stop can't be seen, so by default it
+# waits until half-way, where the full fit would begin. Otherwise, the
+# exponent is fitted to the later half of all of the samples, as it always
+# has been.
+def powerlyse(stepsize, numsteps, minsteps=None, windows=4):
+
+    if minsteps is None:
+        minsteps = numsteps // 2
 
     g.setalgo("HashLife")
     g.setbase(2)
@@ -540,43 +783,35 @@ def powerlyse(stepsize, numsteps):
 
             pointlist.append((math.log(i),math.log(poplist[i]+1.0)))
 
-    power = regress(pointlist)
+        if ((i >= minsteps) and (i % (2 ** windows) == 0)):
 
-    if (power < 1.10):
-        return "unidentified"
-    elif (power < 1.65):
-        return "zz_REPLICATOR"
-    elif (power < 2.05):
-        return "zz_LINEAR"
-    elif (power < 2.8):
-        return "zz_EXPLOSIVE"
-    else:
-        return "zz_QUADRATIC"
+            totals = [poplist[i >> j] - poplist[i >> (j+1)] for j in range(windows)]
+            if (min(totals) > 0):
+                classes = set([power_class(math.log(float(totals[j]) / totals[j+1], 2)) for j in range(windows - 1)])
+                if ((len(classes) == 1) and ("unidentified" not in classes)):
+                    return classes.pop()
+
+    return power_class(regress(pointlist))
 
 # Gets the period of an interleaving of degree-d polynomials:
 def deepperiod(sequence, maxperiod, degree):
 
-    for p in range(1, maxperiod, 1):
-
-        good = True
-
-        for i in range(maxperiod):
-
-            diffs = [0] * (degree + 2)
-            for j in range(degree + 2):
-
-                diffs[j] = sequence[i + j*p]
+    # The (degree+1)th finite difference of the sequence with step p, at
+    # offset i, is the sum of (-1)^j C(degree+1, j) sequence[i + j*p]:
+    coefficients = [1]
+    for j in range(degree + 1):
+        coefficients.append(-coefficients[-1] * (degree + 1 - j) // (j + 1))
 
-            # Produce successive differences:
-            for j in range(degree + 1):
-                for k in range(degree + 1):
-                    diffs[k] = diffs[k] - diffs[k + 1]
+    for p in range(1, maxperiod, 1):
 
-            if (diffs[0] != 0):
-                good = False
-                break
+        # Most periods are rejected by the very first difference:
+        if (sum([c * sequence[j*p] for (j, c) in enumerate(coefficients)]) != 0):
+            continue
 
-        if (good):
+        # Otherwise the differences at every offset are taken together from
+        # slices of the sequence, stopping at the first which isn't zero:
+        terms = [sequence[j*p : j*p + maxperiod] for j in range(degree + 2)]
+        if not any(map(lambda *samples: sum(map(operator.mul, coefficients, samples)), *terms)):
             return p
     return -1
 
@@ -620,114 +855,13 @@ def linearlyse(maxperiod):
     return "yl" + str(p) + "_" + str(q) + "_" + str(moments[0]) + "_" + hashlib.md5(prehash.encode('utf-8')).hexdigest()
 
     
-# This explodes pseudo-still-lifes and pseudo-oscillators into their
-# constituent parts.
-#
-# -- Requires the period (if oscillatory) and graph-theoretic diameter
-#    to not exceed 4096.
-# -- Never mistakenly separates a true object.
-# -- Correctly separates most pseudo-still-lifes, including the famous:
-#    https://www.conwaylife.com/wiki/Quad_pseudo_still_life
-# -- Works perfectly for all still-lifes of up to 17 bits.
-# -- Doesn't separate 'locks', of which the smallest example has 18
-#    bits and is unique:
-#
-#     ** **
-#     ** **
-#
-#    * *** *
-#    ** * **
-#
-# To use this function (standalone), merely copy it into a script of
-# the following form:
-#
-#   import golly as g
-#
-#   def pseudo_bangbang():
-#
-#   [...]
-#
-#   pseudo_bangbang()
-#
-# and execute it in Golly with a B3/S23 universe containing any still-
-# lifes or oscillators you want to separate. Pure objects correspond to
-# connected components in the final state of the universe.
-#
-# This has dependencies on the rules ContagiousLife, PercolateInfection
-# and EradicateInfection.
-#
-# Not to be confused with the Unix shell instruction for repeating the
-# previous instruction as a superuser (sudo !!), or indeed with any
-# parodies of this song: https://www.youtube.com/watch?v=YswhUHH6Ufc
-#
-# Adam P. Goucher, 2014-08-25
-def pseudo_bangbang(alpharule):
-
-    g.setrule("APG_ContagiousLife_" + alpharule)
-    g.setbase(2)
-    g.setstep(12)
-    g.step()
-
-    celllist = g.getcells(g.getrect())
-
-    for i in range(0, len(celllist)-1, 3):
-        
-        # Only infect cells that haven't yet been infected:
-        if (g.getcell(celllist[i], celllist[i+1]) <= 2):
-
-            # Seed an initial 'infected' (red) cell:
-            g.setcell(celllist[i], celllist[i+1], g.getcell(celllist[i], celllist[i+1]) + 2)
-
-            prevpop = 0
-            currpop = int(g.getpop())
-
-            # Continue infecting until the entire component has been engulfed:
-            while (prevpop != currpop):
-
-                # Percolate the infection to every cell in the island:
-                g.setrule("APG_PercolateInfection")
-                g.setbase(2)
-                g.setstep(12)
-                g.step()
-
-                # Transmit the infection across any bridges.
-                g.setrule("APG_ContagiousLife_" + alpharule)
-                g.setbase(2)
-                g.setstep(12)
-                g.step()
-
-                prevpop = currpop
-                currpop = int(g.getpop())
-                
-            g.fit()
-            g.update()
-
-            # Red becomes green:
-            g.setrule("APG_EradicateInfection")
-            g.step()
-
-
-# Counts the number of live cells of each degree:
+# Counts the number of live cells of each degree, from a single fetch of
+# the universe's cells:
 def degreecount():
 
     celllist = g.getcells(g.getrect())
-    counts = [0,0,0,0,0,0,0,0,0]
-
-    for i in range(0, len(celllist), 2):
-
-        x = celllist[i]
-        y = celllist[i+1]
-
-        degree = -1
-
-        for ux in range(x - 1, x + 2):
-            for uy in range(y - 1, y + 2):
-
-                degree += g.getcell(ux, uy)
-
-        counts[degree] += 1
 
-    return counts
+    return degree_histogram(set(zip(celllist[0::2], celllist[1::2])))
 
 # Counts the number of live cells of each degree in generations 1 and 2:
 def degreecount2():
@@ -786,6 +920,419 @@ def countxwsses():
     return(lacount + lbcount, macount + mbcount, hacount + hbcount)
 
 
+# Offsets of the nine cells of a 3-by-3 neighbourhood, and the bit which
+# each contributes to the index of a cell into a rule's transition table:
+neighbourhood = [(dx, dy, 1 << ((dx + 1) + 3*(dy + 1))) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+# Runs a small pattern, given as a set of (x, y) cells, for one generation
+# without using Golly. This is much faster than placing the pattern in a
+# universe when only a handful of generations are needed.
+def evolve(cells, transitions):
+
+    indices = {}
+
+    for (x, y) in cells:
+        for (dx, dy, bit) in neighbourhood:
+            cell = (x - dx, y - dy)
+            indices[cell] = indices.get(cell, 0) | bit
+
+    return set([cell for cell, index in indices.items() if transitions[index]])
+
+# Counts the live cells of each degree (the number of live neighbours) in a
+# set of (x, y) cells:
+def degree_histogram(cells):
+
+    counts = [0,0,0,0,0,0,0,0,0]
+
+    for (x, y) in cells:
+
+        degree = -1
+
+        for (dx, dy, bit) in neighbourhood:
+            if (x + dx, y + dy) in cells:
+                degree += 1
+
+        counts[degree] += 1
+
+    return counts
+
+# Returns the period of a set of cells if it is a still-life or oscillator
+# of period at most maxperiod, or 0 otherwise:
+def oscillator_period(cells, transitions, maxperiod):
+
+    current = cells
+
+    for period in range(1, maxperiod + 1):
+        current = evolve(current, transitions)
+        if (current == cells):
+            return period
+        if (len(current) == 0):
+            return 0
+
+    return 0
+
+# Finds the period of a small pattern (a set of (x, y) cells) in-process,
+# as bijoscar() does in Golly: positive for an oscillator and negative for
+# a spaceship, or -1 if the pattern dies or doesn't repeat within maxsteps
+# generations. The phases are returned too. If the pattern grows beyond
+# maxpop cells, this returns (None, None) and it is best left to Golly.
+def bijoscar_cells(cells, transitions, maxsteps, maxpop, populations=None):
+
+    (left, top) = cell_rect(cells)[:2]
+    initial = set([(x - left, y - top) for (x, y) in cells])
+
+    phases = [cells]
+    current = cells
+
+    for i in range(maxsteps):
+
+        current = evolve(current, transitions)
+
+        if populations is not None:
+            populations.append(len(current))
+
+        if (len(current) == 0):
+            break
+
+        if (len(current) > maxpop):
+            return (None, None)
+
+        if (len(current) == len(cells)):
+            (left2, top2) = cell_rect(current)[:2]
+            if (set([(x - left2, y - top2) for (x, y) in current]) == initial):
+                period = i + 1
+                if ((left2, top2) == (left, top)):
+                    return (period, phases)
+                else:
+                    return (-period, phases)
+
+        phases.append(current)
+
+    return (-1, None)
+
+# Identifies an unidentified object (given as a cell list) without using
+# Golly, so that this can run in a worker process. Returns its period, its
+# canonised representation and the shape key of each phase, as
+# batch_bijoscar() does: an object which dies or doesn't repeat has the
+# result (-1, None, populations), and one which grows beyond 10000 cells
+# has None. A period of -4 is returned too, as the object may be a union
+# of standard spaceships:
+def identify_cells(task):
+
+    (livecells, transitions) = task
+
+    cells = set(zip(livecells[0::2], livecells[1::2]))
+    populations = []
+    (period, phases) = bijoscar_cells(cells, transitions, 1000, 10000, populations)
+
+    if period is None:
+        return None
+
+    if (period == -1):
+        # Golly only needs to catch up with the object and analyse its
+        # growth, which it does far faster than evolve():
+        return (-1, None, populations + [0] * (1000 - len(populations)))
+
+    celllists = [cell_list(phase) for phase in phases]
+    shapekeys = [shape_key(celllists[i], *cell_rect(phases[i])) for i in range(len(phases))]
+
+    return (period, canonise_cells(celllists), shapekeys)
+
+# The main loop of a worker process, which reads numbered objects from the
+# tasks stream and writes what identify_cells() makes of them to the
+# results stream, until its input ends:
+def unid_worker(tasks, results):
+
+    while True:
+
+        try:
+            (index, task) = pickle.load(tasks)
+        except EOFError:
+            break
+
+        # Any failure leaves the object to Golly, rather than leaving the
+        # main process waiting forever:
+        try:
+            result = identify_cells(task)
+        except Exception:
+            result = None
+
+        pickle.dump((index, result), results)
+        results.flush()
+
+# The worker processes run Python itself rather than Golly. This script
+# can't be imported there: Golly runs it without a file name, and it starts
+# a search when run. So each worker is started with this program, and sent
+# the code of unid_worker() and of everything that it uses (which must be
+# compiled by the same version of Python). It answers None once ready:
+unidworkerprogram = '''
+import importlib, marshal, pickle, sys, types
+if (sys.implementation.cache_tag != sys.argv[1]):
+    sys.exit(1)
+(modules, values, functions) = pickle.load(sys.stdin.buffer)
+namespace = dict(values, __builtins__=__builtins__)
+for (name, module) in modules.items():
+    try:
+        namespace[name] = importlib.import_module(module)
+    except ImportError:
+        namespace[name] = None
+for (name, (code, defaults)) in functions.items():
+    namespace[name] = types.FunctionType(marshal.loads(code), namespace, name, defaults)
+pickle.dump(None, sys.stdout.buffer)
+sys.stdout.buffer.flush()
+namespace["unid_worker"](sys.stdin.buffer, sys.stdout.buffer)
+'''
+
+# Collects what a worker process needs in order to run the given function:
+# the names of the modules, the values of the variables and the marshalled
+# code of the functions (with their defaults) of this script which it
+# refers to, directly or through other functions:
+def worker_namespace(function):
+
+    modules = {}
+    values = {}
+    functions = {}
+    pending = [(function.__name__, function)]
+
+    while (len(pending) > 0):
+
+        (name, function) = pending.pop()
+        if name in functions:
+            continue
+        functions[name] = (marshal.dumps(function.__code__), function.__defaults__)
+
+        codes = [function.__code__]
+        names = set()
+        while (len(codes) > 0):
+            code = codes.pop()
+            names.update(code.co_names)
+            codes += [c for c in code.co_consts if isinstance(c, types.CodeType)]
+
+        # Attribute names are among these too, but only globals matter:
+        for globalname in names:
+            if globalname not in function.__globals__:
+                continue
+            value = function.__globals__[globalname]
+            if isinstance(value, types.ModuleType):
+                modules[globalname] = value.__name__
+            elif isinstance(value, types.FunctionType):
+                pending.append((globalname, value))
+            elif not isinstance(value, type):
+                values[globalname] = value
+
+    return (modules, values, functions)
+
+# Returns the path of a Python interpreter in which to run worker processes,
+# or None if there isn't one. Inside Golly, sys.executable is Golly itself,
+# so the interpreter is looked for in the Python installation that Golly
+# has loaded:
+def python_interpreter():
+
+    candidates = [sys.executable]
+    for prefix in [sys.exec_prefix, sys.base_exec_prefix]:
+        candidates.append(os.path.join(prefix, "python.exe"))
+        candidates.append(os.path.join(prefix, "bin", "python%d.%d" % sys.version_info[:2]))
+        candidates.append(os.path.join(prefix, "bin", "python3"))
+
+    for candidate in candidates:
+        if (candidate and os.path.basename(candidate).lower().startswith("python") and
+            os.path.isfile(candidate) and os.access(candidate, os.X_OK)):
+            return candidate
+
+    return None
+
+# Passes numbered objects from the task queue to a worker process, and its
+# answers to the result queue, until it receives None or the worker stops
+# answering:
+def feed_unid_worker(worker, tasks, results):
+
+    for task in iter(tasks.get, None):
+        try:
+            pickle.dump(task, worker.stdin)
+            worker.stdin.flush()
+            results.put(pickle.load(worker.stdout))
+        except Exception:
+            # The worker has died, which identify_unids() will notice:
+            break
+
+# Converts a set of (x, y) cells into a Golly cell list:
+def cell_list(cells):
+
+    return [v for cell in sorted(cells) for v in cell]
+
+# Returns the bounding box [x, y, width, height] of a non-empty set of cells:
+def cell_rect(cells):
+
+    xs = [x for (x, y) in cells]
+    ys = [y for (x, y) in cells]
+
+    return [min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1]
+
+# Returns the bounding box [x, y, width, height] of a non-empty cell list:
+def list_rect(celllist):
+
+    xs = celllist[0::2]
+    ys = celllist[1::2]
+
+    return [min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1]
+
+# Yields every set of at most maxcells cells that is connected through
+# king moves, once for each shape up to rotation and reflection. The sets
+# are grown one cell at a time, discarding duplicates by their shape key.
+def enumerate_polyplets(maxcells):
+
+    level = [frozenset([(0, 0)])]
+
+    for n in range(1, maxcells + 1):
+
+        for cells in level:
+            yield cells
+
+        if (n == maxcells):
+            break
+
+        seen = set()
+        nextlevel = []
+
+        for cells in level:
+            for (x, y) in cells:
+                for (dx, dy, bit) in neighbourhood:
+                    cell = (x + dx, y + dy)
+                    if cell in cells:
+                        continue
+                    newcells = cells | frozenset([cell])
+                    shapekey = shape_key(cell_list(newcells), *cell_rect(newcells))
+                    if shapekey not in seen:
+                        seen.add(shapekey)
+                        nextlevel.append(newcells)
+
+        level = nextlevel
+
+# Returns every distinct orientation of an oscillator, given as a list of
+# its phases. All phases are moved together, so that the first phase of
+# each orientation has its bounding box at the origin:
+def oriented_phases(phases):
+
+    results = set()
+
+    for (a, b, c, d) in orientations:
+        moved = [[(a*x + b*y, c*x + d*y) for (x, y) in cells] for cells in phases]
+        (left, top) = cell_rect(moved[0])[:2]
+        results.add(tuple([frozenset([(x - left, y - top) for (x, y) in cells]) for cells in moved]))
+
+    return [list(result) for result in results]
+
+# Returns the phases of the union of two oscillators (given as lists of
+# phases starting in the same generation) if they never touch or affect
+# each other, or None otherwise. Objects which touch belong to the same
+# island, so are never separated (the long barge is not two tubs):
+def disjoint_union(phasesa, phasesb, transitions):
+
+    pa = len(phasesa)
+    pb = len(phasesb)
+    period = pa * pb // math.gcd(pa, pb)
+
+    union = [phasesa[t % pa] | phasesb[t % pb] for t in range(period)]
+
+    for t in range(period):
+        for (x, y) in phasesb[t % pb]:
+            for (dx, dy, bit) in neighbourhood:
+                if (x + dx, y + dy) in phasesa[t % pa]:
+                    return None
+        if (evolve(union[t], transitions) != union[(t + 1) % period]):
+            return None
+
+    # The union may return to its first phase before either part does:
+    for p in range(1, period):
+        if ((period % p == 0) and (union[p] == union[0])):
+            return union[:p]
+
+    return union
+
+# Separates a still-life or oscillator (given as a set of (x, y) cells) into
+# pure objects without using Golly, returning a list of cell lists. The
+# object starts off divided into islands of touching cells, and each
+# island is run on its own alongside the whole object. Wherever a cell of
+# the whole object is born or dies differently from the islands, the
+# islands near that cell depend on each other (as a birth or survival needs
+# cells from each), so are merged and the process starts again. Once every
+# island runs through the full period on its own, they are pure objects.
+#
+# Each round merges at least two islands, or else the object is returned
+# whole (as it is if it doesn't return to its first phase at all).
+def separate_objects(cells, period, transitions):
+
+    # A union-find forest over the cells:
+    parent = dict([(cell, cell) for cell in cells])
+
+    def find(cell):
+        while (parent[cell] != cell):
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    def merge(cella, cellb):
+        parent[find(cella)] = find(cellb)
+
+    for (x, y) in cells:
+        for (dx, dy, bit) in neighbourhood:
+            if (x + dx, y + dy) in cells:
+                merge((x, y), (x + dx, y + dy))
+
+    for iteration in range(len(cells)):
+
+        islands = {}
+        for cell in cells:
+            islands.setdefault(find(cell), set()).add(cell)
+        roots = list(islands)
+        parts = [islands[root] for root in roots]
+
+        whole = cells
+        mismatches = []
+
+        for t in range(period):
+
+            nextwhole = evolve(whole, transitions)
+            nextparts = [evolve(part, transitions) for part in parts]
+
+            # Cells which no island (or more than one) gives the whole object:
+            owners = {}
+            for part in nextparts:
+                for cell in part:
+                    owners[cell] = owners.get(cell, 0) + 1
+            mismatches = [cell for cell in nextwhole if (owners.get(cell, 0) != 1)]
+            mismatches += [cell for cell in owners if cell not in nextwhole]
+
+            if (len(mismatches) > 0):
+                break
+
+            whole = nextwhole
+            parts = nextparts
+
+        if (len(mismatches) == 0):
+            # Islands must also return to their own first phase, so any which
+            # exchange cells with each other are merged:
+            unfinished = [roots[i] for (i, part) in enumerate(parts) if (part != islands[roots[i]])]
+            if (len(unfinished) == 0):
+                return [cell_list(islands[root]) for root in roots]
+            if (len(unfinished) == 1):
+                break
+            for root in unfinished[1:]:
+                merge(root, unfinished[0])
+            continue
+
+        # Merge every island with a live cell next to a mismatched cell:
+        for (x, y) in mismatches:
+            nearby = [i for (i, part) in enumerate(parts) if any([((x + dx, y + dy) in part) for (dx, dy, bit) in neighbourhood])]
+            for i in nearby[1:]:
+                merge(roots[i], roots[nearby[0]])
+
+        # Nothing left to merge, so the object can't be separated:
+        if (len(set([find(root) for root in roots])) == len(roots)):
+            break
+
+    return [cell_list(cells)]
+
 # Generates the helper rules for apgsearch, given a base outer-totalistic rule.
 class RuleGenerator:
 
@@ -865,6 +1412,35 @@ class RuleGenerator:
     ntbee = {}
     ntess = {}
 
+    # Transition table, computed on demand by transitiontable():
+    transitions = None
+
+    # Tabulates the rule by running each of the 512 possible 3-by-3
+    # neighbourhoods for one generation. Entry n is the next state of the
+    # centre cell of a neighbourhood whose cells, read from the top-left
+    # row by row, are the binary digits of n (least significant first).
+    # This works for any two-state rule that Golly can run.
+    def transitiontable(self):
+
+        if self.transitions is None:
+
+            g.new("Transition table")
+            g.setalgo("QuickLife")
+            g.setrule(self.slashed)
+
+            clist = []
+            for n in range(512):
+                for j in range(9):
+                    if (n & (1 << j)):
+                        clist.append(6*n + (j % 3))
+                        clist.append(int(j / 3))
+            g.putcells(clist)
+            g.run(1)
+
+            self.transitions = [g.getcell(6*n + 1, 1) for n in range(512)]
+
+        return self.transitions
+
     # Save all helper rules:
     def saveAllRules(self):
         
@@ -1141,6 +1717,8 @@ g.show(foo.testHensel())'''
         # Prevent annoying Golly warnings that pause the script and make it nearly
         # impossible to exit.
         rulestring = rulestring.replace("b", "B").replace("s", "S")
+
+        self.transitions = None
         
         mode = 0 #
         s = [False]*9
@@ -2858,6 +3436,420 @@ state 2:  OFF
 """
         self.saverule("APG_ContagiousLife_"+self.alphanumeric, comments, table, colours)
 
+# A dict of bounded size, which evicts its least-recently-used entries
+# once it is full. Seeded entries (for common objects) are kept apart and
+# are never evicted. Lookups made with get() are counted, so that the hit
+# rate can be reported and the size tuned. Keys which aren't held locally
+# are looked up with the fallback function, if there is one (this returns
+# None for keys it doesn't know either).
+class BoundedCache:
+
+    def __init__(self, maxsize, seeds=None):
+
+        self.maxsize = maxsize
+        self.seeded = dict(seeds) if seeds else {}
+        self.entries = collections.OrderedDict()
+        self.fallback = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.sharedhits = 0
+
+        # Time spent identifying the objects that missed:
+        self.misstime = 0.0
+
+    def __len__(self):
+        return len(self.seeded) + len(self.entries)
+
+    def __contains__(self, key):
+        return (key in self.seeded) or (key in self.entries) or self.fetch(key)
+
+    def __getitem__(self, key):
+        if key in self.seeded:
+            return self.seeded[key]
+        if key not in self.entries:
+            self.fetch(key)
+        return self.entries[key]
+
+    def __setitem__(self, key, value):
+        if key in self.seeded:
+            self.seeded[key] = value
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while (len(self.entries) > self.maxsize):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    # Looks up a key, counting the hit or miss:
+    def get(self, key, default=None):
+        if key in self.seeded:
+            self.hits += 1
+            return self.seeded[key]
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.fetch(key):
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    # Copies an entry from the fallback, returning whether there was one:
+    def fetch(self, key):
+        if self.fallback is None:
+            return False
+        value = self.fallback(key)
+        if value is None:
+            return False
+        self.sharedhits += 1
+        self[key] = value
+        return True
+
+    # Adds an entry which will never be evicted:
+    def seed(self, key, value):
+        self.entries.pop(key, None)
+        self.seeded[key] = value
+
+    def items(self):
+        return list(self.seeded.items()) + list(self.entries.items())
+
+    # A short summary for the status line and progress file:
+    def statistics(self):
+        lookups = max(1, self.hits + self.misses)
+        summary = ("%.1f%% hits, %d misses (%.1fs), %d entries, %d evictions" %
+                   (100.0 * self.hits / lookups, self.misses, self.misstime, len(self), self.evictions))
+        if self.fallback is not None:
+            summary += ", %d shared" % self.sharedhits
+        return summary
+
+# Creates or attaches to a shared memory segment without registering it
+# with multiprocessing's resource tracker. The tracker would otherwise be
+# started as a new process running sys.executable, which inside Golly is
+# Golly itself, and it would destroy the segment as soon as any one
+# instance exited. SharedCache.close() removes the segment instead:
+def untracked_shared_memory(name, create, size):
+
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        pass
+
+    # Before Python 3.13, SharedMemory registers every segment it opens:
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size)
+    finally:
+        resource_tracker.register = register
+
+# A hash table in shared memory, through which several instances of
+# apgsearch searching the same rule share the objects they identify. It is
+# an open-addressed table (with linear probing) of slots, each holding the
+# 16-byte MD5 digest of a key, the id of its value and a checksum. Values
+# are interned in a string area after the table, and their ids are their
+# offsets there (plus one, so that a zero id marks an empty slot).
+#
+# The instance which creates the table is its only writer, so readers need
+# no lock. A value is written before the slot which refers to it, but other
+# processes may see those stores in a different order (on ARM, for
+# instance), so a reader could find a slot whose id or value isn't all
+# there yet. The checksum covers the digest, the id and the value, and a
+# reader treats a slot whose checksum doesn't match as empty.
+#
+# The writer removes the table when it closes, after which readers keep
+# the copy they have (without new entries) until they close too.
+class SharedCache:
+
+    header = struct.Struct("<4sIIII")
+    slot = struct.Struct("<16sII")
+
+    def __init__(self, name, nslots=262144, areasize=16777216):
+
+        self.writer = False
+        self.interned = {}
+
+        try:
+            self.shm = untracked_shared_memory(name, True, self.header.size + nslots * self.slot.size + areasize)
+            self.writer = True
+            self.header.pack_into(self.shm.buf, 0, b"apgc", nslots, 0, areasize, 0)
+        except FileExistsError:
+            self.shm = untracked_shared_memory(name, False, 0)
+
+        self.nslots = 0
+
+    # Detaches from the table, and removes it if this is the writer:
+    def close(self):
+
+        self.shm.close()
+        if self.writer:
+            self.shm.unlink()
+
+    # The writer may not have written the header when a reader attaches:
+    def ready(self):
+
+        if (self.nslots == 0):
+            magic, nslots, nentries, areasize, areaused = self.header.unpack_from(self.shm.buf, 0)
+            if (magic == b"apgc"):
+                self.nslots = nslots
+                self.area = self.header.size + nslots * self.slot.size
+
+        return (self.nslots > 0)
+
+    # Returns the slot which holds the key, or the empty slot where it
+    # belongs, together with the id and checksum in that slot:
+    def probe(self, digest):
+
+        i = int.from_bytes(digest[:8], "little") % self.nslots
+
+        while True:
+            offset = self.header.size + i * self.slot.size
+            (slotdigest, valueid, checksum) = self.slot.unpack_from(self.shm.buf, offset)
+            if ((valueid == 0) or (slotdigest == digest)):
+                return (offset, valueid, checksum)
+            i = (i + 1) % self.nslots
+
+    # The checksum of a slot holding a digest and the encoded value it names:
+    def checksum(self, digest, valueid, encoded):
+
+        return zlib.crc32(digest + valueid.to_bytes(4, "little") + encoded)
+
+    def get(self, key):
+
+        if not self.ready():
+            return None
+
+        digest = hashlib.md5(key.encode('utf-8')).digest()
+        (offset, valueid, checksum) = self.probe(digest)
+
+        if (valueid == 0):
+            return None
+
+        start = self.area + valueid - 1
+        length = int.from_bytes(self.shm.buf[start:start+2], "little")
+        encoded = bytes(self.shm.buf[start+2:start+2+length])
+
+        if (checksum != self.checksum(digest, valueid, encoded)):
+            return None
+
+        return encoded.decode('utf-8')
+
+    # Adds or replaces an entry (only the writer may do this). Once the table
+    # is three-quarters full, or its string area is full, new keys are
+    # dropped and each instance relies on its own cache for them:
+    def put(self, key, value):
+
+        (magic, nslots, nentries, areasize, areaused) = self.header.unpack_from(self.shm.buf, 0)
+
+        if not self.ready():
+            return
+
+        digest = hashlib.md5(key.encode('utf-8')).digest()
+        (offset, valueid, checksum) = self.probe(digest)
+
+        if ((valueid == 0) and (4 * nentries >= 3 * nslots)):
+            return
+
+        encoded = value.encode('utf-8')
+
+        if value not in self.interned:
+            if ((len(encoded) > 65535) or (areaused + 2 + len(encoded) > areasize)):
+                return
+            start = self.area + areaused
+            self.shm.buf[start:start+2] = len(encoded).to_bytes(2, "little")
+            self.shm.buf[start+2:start+2+len(encoded)] = encoded
+            self.interned[value] = areaused + 1
+            areaused += 2 + len(encoded)
+
+        if (valueid == 0):
+            nentries += 1
+
+        valueid = self.interned[value]
+        self.slot.pack_into(self.shm.buf, offset, digest, valueid, self.checksum(digest, valueid, encoded))
+        self.header.pack_into(self.shm.buf, 0, magic, nslots, nentries, areasize, areaused)
+
+# Objects are named by their apgcodes. A still-life, oscillator or
+# spaceship has a prefix giving its population or period ("xs18", "xp15"
+# or "xq4"), an underscore, and the extended Wechsler format of its
+# canonical phase and orientation. Encoding and decoding all happen here,
+# so that canonise_cells(), verifyobj(), display_census() and the cache
+# importers agree on what each apgcode means.
+#
+# https://ferkeltongs.livejournal.com/15837.html
+
+# Converts a base-36 case-insensitive alphanumeric character into a
+# numerical value.
+def ord2(char):
+
+    x = ord(char)
+
+    if ((x >= 48) & (x < 58)):
+        return x - 48
+
+    if ((x >= 65) & (x < 91)):
+        return x - 55
+
+    if ((x >= 97) & (x < 123)):
+        return x - 87
+
+    return -1
+
+# Writes strips of five rows (lists of baudot digits, one per column) in
+# extended Wechsler format, or returns None if this would take more than
+# limit characters:
+def wechsler_strips(strips, limit=None):
+
+    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+    parts = []
+    size = 0
+
+    for v in range(len(strips)):
+        zeroes = 0
+        if (v != 0):
+            parts.append("z")
+            size += 1
+        for baudot in strips[v]:
+            if (baudot == 0):
+                zeroes += 1
+            else:
+                # Gaps longer than "yz" (39 columns) are split up:
+                while (zeroes >= 40):
+                    parts.append("yz")
+                    size += 2
+                    zeroes -= 39
+                if (zeroes > 0):
+                    if (zeroes == 1):
+                        parts.append("0")
+                    elif (zeroes == 2):
+                        parts.append("w")
+                    elif (zeroes == 3):
+                        parts.append("x")
+                    else:
+                        parts.append("y" + chars[zeroes - 4])
+                    size += len(parts[-1])
+                zeroes = 0
+                parts.append(chars[baudot])
+                size += 1
+        if ((limit is not None) and (size > limit)):
+            return None
+
+    return "".join(parts)
+
+# Reads the extended Wechsler format back into strips of five rows (lists
+# of baudot digits, one per column), ignoring any invalid characters:
+def wechsler_to_strips(wechsler):
+
+    strips = [[]]
+    i = 0
+
+    while (i < len(wechsler)):
+        c = ord2(wechsler[i])
+        if (c == 35):
+            # End of line:
+            strips.append([])
+        elif (c >= 32):
+            # Multispace character:
+            strips[-1] += [0] * (c - 30)
+            if ((c == 34) and (i + 1 < len(wechsler))):
+                i += 1
+                strips[-1] += [0] * ord2(wechsler[i])
+        elif (c >= 0):
+            # Conventional character:
+            strips[-1].append(c)
+        i += 1
+
+    return strips
+
+# Recently decoded objects, as cell lists:
+decodedobjects = BoundedCache(10000)
+
+# Decodes an apgcode (of any prefix) into a cell list, with the top-left
+# of its bounding box (before trimming) at the origin. The list returned is
+# a copy, so may be changed by the caller:
+def decode_apgcode(apgcode):
+
+    celllist = decodedobjects.get(apgcode)
+
+    if celllist is None:
+        celllist = []
+        for v, strip in enumerate(wechsler_to_strips(apgcode.split('_')[1])):
+            for u, d in enumerate(strip):
+                for w in range(5):
+                    if ((d >> w) & 1):
+                        celllist += [u, 5*v + w]
+        decodedobjects[apgcode] = celllist
+
+    return list(celllist)
+
+# Returns the period of a still-life (1), oscillator or spaceship from its
+# apgcode, raising ValueError for any other apgcode:
+def apgcode_period(apgcode):
+
+    if (apgcode[:2] not in ["xs", "xp", "xq"]):
+        raise ValueError(apgcode)
+    if (apgcode[1] == 's'):
+        return 1
+
+    return int(apgcode[2:apgcode.find('_')])
+
+# Names a still-life, oscillator (period > 1) or spaceship (period < 0)
+# from its canonised representation:
+def make_apgcode(period, population, canonised):
+
+    if (period == 1):
+        return "xs" + str(population) + "_" + canonised
+    elif (period > 0):
+        return "xp" + str(period) + "_" + canonised
+
+    return "xq" + str(0 - period) + "_" + canonised
+
+# Writes a cell list as an RLE pattern file:
+def cells_to_rle(celllist, rule):
+
+    if (len(celllist) == 0):
+        return "x = 0, y = 0, rule = " + rule + "\n!\n"
+
+    xs = celllist[0::2]
+    ys = celllist[1::2]
+    left = min(xs)
+    top = min(ys)
+
+    rows = {}
+    for i in range(len(xs)):
+        rows.setdefault(ys[i] - top, []).append(xs[i] - left)
+
+    # Runs of dead ("b") and live ("o") cells, and ends of rows ("$"):
+    runs = []
+    prevy = 0
+    for y in sorted(rows):
+        if (y > prevy):
+            runs.append((y - prevy, "$"))
+        prevy = y
+        x = 0
+        for cx in sorted(rows[y]):
+            if (cx > x):
+                runs.append((cx - x, "b"))
+            if ((len(runs) > 0) and (runs[-1][1] == "o") and (cx == x)):
+                runs[-1] = (runs[-1][0] + 1, "o")
+            else:
+                runs.append((1, "o"))
+            x = cx + 1
+    runs.append((1, "!"))
+
+    # Lines of RLE are kept within 70 characters:
+    rledata = "x = " + str(max(xs) - left + 1) + ", y = " + str(max(ys) - top + 1) + ", rule = " + rule + "\n"
+    line = ""
+    for (n, char) in runs:
+        token = (str(n) if (n > 1) else "") + char
+        if (len(line) + len(token) > 70):
+            rledata += line + "\n"
+            line = ""
+        line += token
+
+    return rledata + line + "\n"
+
 class Soup:
 
     def __init__(self):
@@ -2868,28 +3860,34 @@ class Soup:
         # Should we skip error-correction:
         self.skipErrorCorrection = False
 
-        # A dict mapping binary representations of small possibly-pseudo-objects
-        # to their equivalent canonised representation.
+        # Are pseudo-objects counted as single objects:
+        self.pseudo = False
+
+        # A dict mapping the shape keys of possibly-pseudo-objects to their
+        # equivalent canonised representation.
+        # Shape keys do not depend on position or orientation, so these all
+        # share a single entry for one phase of the beacon on block:
         #
-        # This is many-to-one, as (for example) all of these will map to
-        # the same pseudo-object (namely the beacon on block):
+        # ..**.**  **.**..  **.....
+        # ..**.**  **.**..  **.....
+        # **.....  .....**  ..**...
+        # **.....  .....**  ..**... [...5 others omitted...]
+        # .......  .......  .......
+        # .......  .......  ..**...
+        # .......  .......  ..**...
         #
-        # ..**.**  ..**.**  **.....                           **.....
-        # ..**.**  ...*.**  **.....                           *......
-        # **.....  *......  ..**...                           ...*.**
-        # **.....  **.....  ..**... [...12 others omitted...] ..**.**
-        # .......  .......  .......                           .......
-        # .......  .......  ..**...                           .......
-        # .......  .......  ..**...                           .......
+        # It is still many-to-one, since each phase of an oscillator has a
+        # different shape key (but maps to the same canonised representation).
         #
         # The first few soups are much slower to process, as objects are being
-        # entered into the cache.
-        self.cache = {}
+        # entered into the cache. It holds at most 100000 entries (besides any
+        # seeded ones), which is plenty for the common objects of any rule.
+        self.cache = BoundedCache(100000)
 
         # A dict to store memoized decompositions of possibly-pseudo-objects
         # into constituent parts. This is initialised with the unique minimal
         # pseudo-still-life (two blocks on lock) that cannot be automatically
-        # separated by the routine pseudo_bangbang(). Any larger objects are
+        # separated by the routine separate_objects(). Any larger objects are
         # ambiguous, such as this one:
         #
         #     *
@@ -2903,7 +3901,41 @@ class Soup:
         # Ahh, the joys of non-associativity.
         #
         # See https://paradise.caltech.edu/~cook/Workshop/CAs/2DOutTot/Life/StillLife/StillLifeTheory.html
-        self.decompositions = {"xs18_3pq3qp3": ["xs14_3123qp3", "xs4_33"]}
+        self.decompositions = BoundedCache(50000, {"xs18_3pq3qp3": ["xs14_3123qp3", "xs4_33"]})
+
+        # Switch engines, guns and puffers recur from soup to soup, and each
+        # takes linearlyse() and perhaps powerlyse() to classify. This maps
+        # a growth signature (see growth_signature()) to the yl or zz code
+        # found for it, so that recurrences are classified immediately:
+        self.growthmemo = BoundedCache(10000)
+
+        # The census files already imported by import_censuses(), mapping a
+        # digest of each path to its size and modification time:
+        self.importedcensuses = {}
+
+        # The largest objects (in cells) and periods up to which seed_cache()
+        # ("s") and seed_pseudo_objects() ("p") have filled the on-disk cache,
+        # so that later runs needn't enumerate them again:
+        self.seededto = {"s": (0, 0), "p": (0, 0)}
+
+        # The cache, decompositions, growth memo and imported census files
+        # are also kept on disk (one file per rule and mode), so that
+        # restarts and other instances begin warm. Set cachedir to a
+        # directory path to store them somewhere other than the Golly data
+        # directory:
+        self.cachedir = None
+        self.cacheloaded = False
+        self.pendingcache = []
+
+        # Instances searching the same rule on one machine may also share
+        # their caches through shared memory (where Python supports it). The
+        # first instance to start maintains the shared table, reading what
+        # the others identify from the on-disk cache:
+        self.sharecache = False
+        self.sharedcache = None
+        self.cachefileid = None
+        self.cachefileoffset = 0
+
         self.apgcodetorle = {}#Stores the corresponding rles for apgcodes, enabling the census to throw out faulty apgcodes.
         
         # A dict of objects in the form {"identifier": ("common name", points)}
@@ -3104,6 +4136,37 @@ class Soup:
         # Temporary list of unidentified objects:
         self.unids = []
 
+        # Journal of every change that the current page has made to the
+        # census, so that error-correction can undo the contributions of
+        # individual soups. Each entry is a tuple (soupid, kind, key, value),
+        # where soupid is None for objects removed by the census rules:
+        self.journal = []
+
+        # Unidentified objects are analysed in this many worker processes,
+        # as well as in Golly (which must still analyse infinite growth).
+        # The pool holds the task and result queues, the processes and the
+        # threads feeding them, once started. A page whose objects aren't
+        # all analysed within unidtimeout seconds leaves the rest to Golly:
+        self.unidworkers = 0
+        self.unidpool = None
+        self.unidtimeout = 120
+
+        # Placement index of the current page, mapping positions to soup ids:
+        self.placement = ([0], [([0], [0])])
+
+        # Stabilised ashes awaiting a census, bucketed into tiny, medium and
+        # huge size classes. A page is censused once its bucket is full:
+        self.ashbuckets = [[], [], []]
+
+        # Many soups stabilise into exactly the same tiny ash. This maps a
+        # digest of each tiny ash (relative to its top-left corner) to None
+        # once it has been seen, and then to its contribution to the census
+        # once it has been seen twice, so that later copies are credited to
+        # their soups without being placed on a page. Ashes whose census
+        # can't be remembered (those with pathological or oversized objects)
+        # map to True instead, and always go on a page:
+        self.ashmemo = BoundedCache(20000)
+
         # Things like glider guns and large oscillators belong here:
         self.superunids = []
         self.gridsize = 0
@@ -3114,13 +4177,43 @@ class Soup:
         self.ruletime = 0.0
         self.gridtime = 0.0
 
+        # Total time spent censusing each size class, and the number of ashes
+        # censused, from which the census cost of each ash is amortised:
+        self.censustime = [0.0, 0.0, 0.0]
+        self.censusashes = [0, 0, 0]
+
+        # The same, for the census pages filled by each page size (gsize) of
+        # soups, so that each value of sqrtspp is charged what its own
+        # census pages cost. This maps (sizeclass, gsize) to [time, ashes]:
+        self.pagecensus = {}
+
     # Increment object count by given value:
-    def incobject(self, obj, incval):
+    def incobject(self, obj, incval, soupid=None):
         if (incval > 0):
             if obj in self.objectcounts:
                 self.objectcounts[obj] = self.objectcounts[obj] + incval
             else:
                 self.objectcounts[obj] = incval
+            self.journal.append((soupid, "object", obj, incval))
+
+    # Decrement object count by given value, forgetting it if it reaches zero:
+    def decobject(self, obj, decval):
+        if ((decval > 0) and (obj in self.objectcounts)):
+            self.objectcounts[obj] = self.objectcounts[obj] - decval
+            if (self.objectcounts[obj] <= 0):
+                del self.objectcounts[obj]
+
+    # Add one occurrence of an object to the census on behalf of a soup:
+    def creditobject(self, soupid, obj):
+        self.incobject(obj, 1, soupid)
+        self.awardpoints2(soupid, obj)
+
+    # Record an oversized or pathological object found in the current page:
+    def addsuperunid(self, livecells, x, y):
+        self.superunids.append(livecells)
+        self.superunids.append(x)
+        self.superunids.append(y)
+        self.journal.append((locate_soup(self.placement, x, y), "superunid", None, livecells))
 
     # Increment soup score by given value:
     def awardpoints(self, soupid, incval):
@@ -3129,17 +4222,65 @@ class Soup:
                 self.soupscores[soupid] = self.soupscores[soupid] + incval
             else:
                 self.soupscores[soupid] = incval
+            self.journal.append((soupid, "score", soupid, incval))
+
+    # Reverse a single journal entry:
+    def undo(self, entry):
+
+        soupid, kind, key, value = entry
+
+        if (kind == "object"):
+            self.decobject(key, value)
+        elif (kind == "score"):
+            if key in self.soupscores:
+                self.soupscores[key] = self.soupscores[key] - value
+                if (self.soupscores[key] <= 0):
+                    del self.soupscores[key]
+        elif (kind == "occur"):
+            if ((key in self.alloccur) and (value in self.alloccur[key])):
+                self.alloccur[key].remove(value)
+                if (len(self.alloccur[key]) == 0):
+                    del self.alloccur[key]
+        elif (kind == "superunid"):
+            for i in range(len(self.superunids) - 3, -1, -3):
+                if self.superunids[i] is value:
+                    del self.superunids[i:i+3]
+                    break
+
+    # Gives the places in occurrence lists freed by undone soups to the soups
+    # in the journal which were refused them, in the order they were refused,
+    # as if the undone soups had never been counted:
+    def readmit_refused(self):
+
+        for i in range(len(self.journal)):
+            soupid, kind, obj, value = self.journal[i]
+            if (kind == "refused"):
+                occurrences = self.alloccur.setdefault(obj, [])
+                if ((len(occurrences) < 10) and (soupid not in occurrences)):
+                    occurrences.append(soupid)
+                    self.journal[i] = (soupid, "occur", obj, soupid)
+
+    # The current page has been censused successfully, so its changes no
+    # longer need to be undoable:
+    def commit_journal(self):
+        self.journal = []
 
     # Increment soup score by appropriate value:
     def awardpoints2(self, soupid, obj):
 
-        # Record the occurrence of this object:
+        # Record the occurrence of this object. A soup refused a place in a
+        # full list is journalled too, so that it can have the place of a
+        # soup which is rolled back:
         if (obj in self.alloccur):
-            if (len(self.alloccur[obj]) < 10):
-                if (soupid not in self.alloccur[obj]):
+            if (soupid not in self.alloccur[obj]):
+                if (len(self.alloccur[obj]) < 10):
                     self.alloccur[obj] += [soupid]
+                    self.journal.append((soupid, "occur", obj, soupid))
+                else:
+                    self.journal.append((soupid, "refused", obj, soupid))
         else:
             self.alloccur[obj] = [soupid]
+            self.journal.append((soupid, "occur", obj, soupid))
         
         if obj in self.commonnames:
             self.awardpoints(soupid, self.commonnames[obj][1])
@@ -3165,55 +4306,15 @@ class Soup:
         #Testing suggests it takes around 7 milliseconds per generation the pattern is run through,
         #so for a typical Pseudo_C1_Test haul, it takes ~330*7 = 2310 milliseconds, which is a little long,
         #but census safety takes priority over performance.
+        if objname in self.apgcodetorle:
+            # Already verified (or imported from a census):
+            return True
         if (objname[0] == 'x'):
-            # Canonised objects are at most 40-by-40:
-            rledata = ''
-            # https://ferkeltongs.livejournal.com/15837.html
-            compact = objname.split('_')[1] + "z"
-            i = 0
-            strip = []
-            while (i < len(compact)):
-                c = ord2(compact[i])
-                if (c >= 0):
-                    if (c < 32):
-                        # Conventional character:
-                        strip.append(c)
-                    else:
-                        if (c == 35):
-                            # End of line:
-                            if (len(strip) == 0):
-                                strip.append(0)
-                            for j in range(5):
-                                for d in strip:
-                                    if ((d & (1 << j)) > 0):
-                                        rledata += "o"
-                                    else:
-                                        rledata += "b"
-                                rledata += "$\n"
-                            strip = []
-                        else:
-                            # Multispace character:
-                            strip.append(0)
-                            strip.append(0)
-                            if (c >= 33):
-                                strip.append(0)
-                            if (c == 34):
-                                strip.append(0)
-                                i += 1
-                                d = ord2(compact[i])
-                                for j in range(d):
-                                    strip.append(0)
-                i += 1
-            # End of pattern representation:
-            rledata += "!"
+            celllist = decode_apgcode(objname)
             g.new('Verifying objects')
             g.setrule(self.rg.slashed)
-            g.putcells(g.parse(rledata), 0, 0)
-            period = 0
-            if objname[0:2] == 'xs':
-                period = 1
-            else:
-                period = int(objname[2:objname.find('_')])
+            g.putcells(celllist, 0, 0)
+            period = apgcode_period(objname)
             if g.getpop() != '0':
                 startpattern = g.hash(g.getrect())
             else:
@@ -3225,12 +4326,18 @@ class Soup:
                 endpattern = 'fbudnfiunfsnjfnsfsadsaasdsadadajfs'
             if not startpattern == endpattern:
                 g.warn(objname)
+            else:
+                self.apgcodetorle[objname] = cells_to_rle(celllist, self.rg.slashed)
             return startpattern == endpattern
         else:
             return True
-    # Assuming the pattern has stabilised, perform a census:
+    # Assuming the pattern has stabilised, perform a census. The objects
+    # removed by the rules cannot be attributed to individual soups, so
+    # their counts are returned as a dict for the caller to add:
     def census(self, stepsize):
 
+        counts = {}
+
         g.setrule("APG_CoalesceObjects_" + self.rg.alphanumeric)
         g.setbase(2)
         g.setstep(stepsize)
@@ -3272,7 +4379,7 @@ class Soup:
             pop5 = int(g.getpop())
             g.run(1)
             pop6 = int(g.getpop())
-            self.incobject("xq4_153", int((pop5 - pop6)/5))
+            counts["xq4_153"] = int((pop5 - pop6)/5)
 
         # Remove any blocks, blinkers and beehives:
         g.setrule("APG_ExpungeObjects")
@@ -3287,10 +4394,12 @@ class Soup:
         pop4 = int(g.getpop())
 
         # Dots, Blocks, blinkers and beehives removed by ExpungeObjects:
-        self.incobject("xs1_1", int((pop0-pop1)))
-        self.incobject("xs4_33", int((pop1-pop2)/4))
-        self.incobject("xp2_7", int((pop2-pop3)/5))
-        self.incobject("xs6_696", int((pop3-pop4)/8))
+        counts["xs1_1"] = int((pop0-pop1))
+        counts["xs4_33"] = int((pop1-pop2)/4)
+        counts["xp2_7"] = int((pop2-pop3)/5)
+        counts["xs6_696"] = int((pop3-pop4)/8)
+
+        return counts
 
     # Removes an object incident with (ix, iy) and returns the cell list:
     def grabobj(self, ix, iy):
@@ -3330,7 +4439,7 @@ class Soup:
         return livecells
 
     # Command to Grab, Remove and IDentify an OBJect:
-    def gridobj(self, ix, iy, gsize, gspacing, pos):
+    def gridobj(self, ix, iy):
 
         allcells = [ix, iy, g.getcell(ix, iy)]
         g.setcell(ix, iy, 0)
@@ -3402,41 +4511,36 @@ class Soup:
         self.gridsize = max(self.gridsize, llength)
 
         objid = "unidentified"
-        bitstring = 0
+        shapekey = None
 
         if (lpop == 0):
             objid = "nothing"
         else:
-            if ((lwidth <= 7) & (lheight <= 7)):
-                for i in range(0, lpop*2, 2):
-                    bitstring += (1 << ((livecells[i] - lleft) + 7*(livecells[i + 1] - ltop)))
+            shapekey = shape_key(livecells, lleft, ltop, lwidth, lheight)
 
-                if bitstring in self.cache:
-                    objid = self.cache[bitstring]
+            objid = self.cache.get(shapekey, "unidentified")
+
+            # Cached objects which need separating can only be used if their
+            # decomposition hasn't been evicted:
+            if (self.decomposable(objid) and (objid not in self.decompositions)):
+                objid = "unidentified"
 
         if (objid == "unidentified"):
             # This has passed through the routing logic without being identified,
             # so save it in a temporary list for later identification:
-            self.unids.append(bitstring)
-            self.unids.append(livecells)
-            self.unids.append(lleft)
-            self.unids.append(ltop)
+            self.unids.append((shapekey, livecells, lleft, ltop))
         elif (objid != "nothing"):
             # The object is non-empty, so add it to the census:
-            ux = int(0.5 + float(lleft)/float(gspacing))
-            uy = int(0.5 + float(ltop)/float(gspacing))
-            soupid = ux + (uy * gsize) + pos
+            soupid = locate_soup(self.placement, lleft, ltop)
 
             # Check whether the cached object is in the set of decompositions
             # (this is usually the case, unless for example it is a high-period
             # albeit small spaceship):
             if objid in self.decompositions:            
                 for comp in self.decompositions[objid]:
-                    self.incobject(comp, 1)
-                    self.awardpoints2(soupid, comp)
+                    self.creditobject(soupid, comp)
             else:
-                self.incobject(objid, 1)
-                self.awardpoints2(soupid, objid)
+                self.creditobject(soupid, objid)
 
 
     # Tests for population periodicity:
@@ -3560,7 +4664,7 @@ class Soup:
         return 12
 
     # Differs from oscar.py in that it detects absolute cycles, not eventual cycles.
-    def bijoscar(self, maxsteps):
+    def bijoscar(self, maxsteps, populations=None):
 
         initpop = int(g.getpop())
         initrect = g.getrect()
@@ -3571,8 +4675,12 @@ class Soup:
         for i in range(maxsteps):
 
             g.run(1)
+            pop = int(g.getpop())
+
+            if populations is not None:
+                populations.append(pop)
 
-            if (int(g.getpop()) == initpop):
+            if (pop == initpop):
 
                 prect = g.getrect()
                 phash = g.hash(prect)
@@ -3587,6 +4695,87 @@ class Soup:
                         return -period
         return -1
 
+    # Does the work of bijoscar() for many objects (given as cell lists) at
+    # once. They are laid out on a grid in a single universe, spaced so that
+    # nothing travelling at lightspeed can reach a neighbour's region within
+    # maxsteps generations, and run together. Each object's period and
+    # displacement are found from the cells in its own region, which also
+    # provide its phases for canonise_cells(). Returns a list of results like
+    # those of identify_cells(), in the same order. An object which dies or
+    # doesn't repeat in time (for which bijoscar() would return -1) has the
+    # result (-1, None, populations), giving its population in each of the
+    # maxsteps generations; one which grows beyond maxpop cells has None:
+    def batch_bijoscar(self, celllists, maxsteps=1000, maxpop=10000):
+
+        results = [None] * len(celllists)
+        if (len(celllists) == 0):
+            return results
+
+        rects = [list_rect(celllist) for celllist in celllists]
+        maxsize = max([max(rect[2], rect[3]) for rect in rects])
+        spacing = maxsize + 2 * maxsteps + 2
+        columns = int(math.ceil(math.sqrt(len(celllists))))
+
+        g.new("Unidentified objects")
+        g.setalgo("QuickLife")
+        g.setrule(self.rg.slashed)
+
+        # Each object is tracked by its region, population, initial cells
+        # (relative to the corner of its bounding box), the position of that
+        # corner, the phases seen so far and the populations since:
+        tracking = {}
+        for i in range(len(celllists)):
+            left = (i % columns) * spacing
+            top = (i // columns) * spacing
+            dx = left + maxsteps + 1 - rects[i][0]
+            dy = top + maxsteps + 1 - rects[i][1]
+            g.putcells(celllists[i], dx, dy)
+            placed = [v + (dy if (j & 1) else dx) for (j, v) in enumerate(celllists[i])]
+            corner = (rects[i][0] + dx, rects[i][1] + dy)
+            initial = set([(x - corner[0], y - corner[1]) for (x, y) in zip(placed[0::2], placed[1::2])])
+            tracking[i] = ([left, top, spacing, spacing], len(placed) // 2, initial, corner, [placed], [])
+
+        for t in range(maxsteps):
+
+            if (len(tracking) == 0):
+                break
+
+            g.run(1)
+
+            for i in list(tracking):
+
+                (region, initpop, initial, corner, phases, populations) = tracking[i]
+                celllist = g.getcells(region)
+                pop = len(celllist) // 2
+                populations.append(pop)
+
+                if (pop == 0):
+                    results[i] = (-1, None, populations + [0] * (maxsteps - len(populations)))
+                    del tracking[i]
+                    continue
+
+                if (pop > maxpop):
+                    del tracking[i]
+                    continue
+
+                if (pop == initpop):
+                    (left2, top2) = list_rect(celllist)[:2]
+                    if (set([(x - left2, y - top2) for (x, y) in zip(celllist[0::2], celllist[1::2])]) == initial):
+                        period = t + 1
+                        if ((left2, top2) != corner):
+                            period = -period
+                        shapekeys = [shape_key(phase, *list_rect(phase)) for phase in phases]
+                        results[i] = (period, canonise_cells(phases), shapekeys)
+                        del tracking[i]
+                        continue
+
+                phases.append(celllist)
+
+        for i in tracking:
+            results[i] = (-1, None, tracking[i][5])
+
+        return results
+
     # For a non-moving unidentified object, we check the dictionary of
     # memoized decompositions of possibly-pseudo-objects. If the object is
     # not already in the dictionary, it will be memoized.
@@ -3598,7 +4787,17 @@ class Soup:
     # @param moving  a bool which specifies whether the object is moving
     def enter_unid(self, unidname, soupid, moving):
 
-        if not(unidname in self.decompositions):
+        self.decompose(unidname, moving)
+
+        # Actually add to the census:
+        for comp in self.decompositions[unidname]:
+            self.creditobject(soupid, comp)
+
+    # Memoizes the decomposition of the object in the universe, unless it
+    # is already known:
+    def decompose(self, unidname, moving):
+
+        if self.decompositions.get(unidname) is None:
             if not self.pseudo:
                 # Separate into pure components:
                 if (moving):
@@ -3606,22 +4805,33 @@ class Soup:
                     g.setbase(2)
                     g.setstep(3)
                     g.step()
-                else:
-                    pseudo_bangbang(self.rg.alphanumeric)
 
-                listoflists = [] # which incidentally don't contain themselves.
+                    listoflists = [] # which incidentally don't contain themselves.
 
-                # Someone who plays the celllo:
-                celllist = g.join(g.getcells(g.getrect()), [0])
-
-                for i in range(0, len(celllist)-1, 3):
-                    if (g.getcell(celllist[i], celllist[i+1]) != 0):
-                        livecells = self.grabobj(celllist[i], celllist[i+1])
-                        if (len(livecells) > 0):
-                            listoflists.append(livecells)
+                    # Someone who plays the celllo:
+                    celllist = g.join(g.getcells(g.getrect()), [0])
 
+                    for i in range(0, len(celllist)-1, 3):
+                        if (g.getcell(celllist[i], celllist[i+1]) != 0):
+                            livecells = self.grabobj(celllist[i], celllist[i+1])
+                            if (len(livecells) > 0):
+                                listoflists.append(livecells)
+                else:
+                    # Still-lifes and oscillators are separated in-process:
+                    celllist = g.getcells(g.getrect())
+                    cells = set([(celllist[i], celllist[i+1]) for i in range(0, len(celllist), 2)])
+                    period = apgcode_period(unidname)
+                    listoflists = separate_objects(cells, period, self.rg.transitiontable())
+
+                # The components are run together in a single universe, and
+                # only those which don't repeat there are examined one by one:
+                results = self.batch_bijoscar(listoflists)
                 listofobjs = []
-                for livecells in listoflists:
+                for (livecells, result) in zip(listoflists, results):
+
+                    if ((result is not None) and (result[0] != -1)):
+                        listofobjs.append(make_apgcode(result[0], len(livecells) // 2, result[1]))
+                        continue
 
                     g.new("Subcomponent")
                     g.setalgo("QuickLife")
@@ -3635,41 +4845,271 @@ class Soup:
                         listofobjs.append("xs"+str(int(len(livecells)/2))+"_"+canonised)
                     else:
                         listofobjs.append("xp"+str(period)+"_"+canonised)
-                self.decompositions[unidname] = listofobjs
+                self.setdecomposition(unidname, listofobjs)
             else:
-                self.decompositions[unidname] = [unidname]
+                self.setdecomposition(unidname, [unidname])
                 #This means that all pseudo-objects will be decomposed into themselves.
 
-        # Actually add to the census:
-        for comp in self.decompositions[unidname]:
-            self.incobject(comp, 1)
-            self.awardpoints2(soupid, comp)
+    # Pre-fills the cache with every connected still-life and oscillator of
+    # period at most maxperiod which has at most maxcells cells, so that the
+    # first pages of a haul already run at full speed. Objects already in
+    # the on-disk cache aren't canonised again. These entries are seeded,
+    # so are never evicted. Objects whose cells aren't king-connected in
+    # any phase (such as the aircraft carrier) are left to be learnt from
+    # soups in the usual way.
+    def seed_cache(self, maxcells, maxperiod):
+
+        if self.already_seeded("s", maxcells, maxperiod):
+            return
+
+        transitions = self.rg.transitiontable()
+        seeded = 0
+
+        for cells in enumerate_polyplets(maxcells):
+            period = oscillator_period(cells, transitions, maxperiod)
+            if (period > 0):
+                self.seed_object(cells, period)
+                seeded += 1
+                if (seeded % 50 == 0):
+                    g.show("Seeding cache: " + str(seeded) + " objects found with up to " + str(maxcells) + " cells...")
+
+        self.mark_seeded("s", maxcells, maxperiod)
+
+    # Returns whether the on-disk cache has already been seeded (by
+    # seed_cache() for "s", or seed_pseudo_objects() for "p") with objects
+    # of up to maxcells cells and period maxperiod. The entries found then
+    # are loaded with the rest of the cache:
+    def already_seeded(self, kind, maxcells, maxperiod):
+
+        if not self.cacheloaded:
+            self.load_cache()
+
+        (seededcells, seededperiod) = self.seededto[kind]
+
+        return ((seededcells >= maxcells) and (seededperiod >= maxperiod))
+
+    # Saves the entries found by seeding, followed by a record of how far the
+    # seeding went:
+    def mark_seeded(self, kind, maxcells, maxperiod):
+
+        self.seededto[kind] = (maxcells, maxperiod)
+        self.pendingcache.append("%s %d %d\n" % (kind, maxcells, maxperiod))
+        self.save_cache()
+
+    # Seeds the cache with every phase of a known still-life or oscillator,
+    # given as a set of (x, y) cells:
+    def seed_object(self, cells, period):
+
+        transitions = self.rg.transitiontable()
+        livecells = cell_list(cells)
+        shapekey = shape_key(livecells, *cell_rect(cells))
+
+        if ((shapekey in self.cache) and (self.cache[shapekey] in self.decompositions)):
+            descriptor = self.cache[shapekey]
+        else:
+            g.new("Seeding cache")
+            g.setalgo("QuickLife")
+            g.setrule(self.rg.slashed)
+            g.putcells(livecells)
+            canonised = canonise(period)
+            if (canonised == "#"):
+                return
+            if (period == 1):
+                descriptor = "xs" + str(len(cells)) + "_" + canonised
+            else:
+                descriptor = "xp" + str(period) + "_" + canonised
+            self.decompose(descriptor, False)
+
+        self.decompositions.seed(descriptor, self.decompositions[descriptor])
+
+        for t in range(period):
+            shapekey = shape_key(cell_list(cells), *cell_rect(cells))
+            self.setcache(shapekey, descriptor)
+            self.cache.seed(shapekey, descriptor)
+            cells = evolve(cells, transitions)
+
+    # Pre-fills the decompositions with pseudo-still-lifes and pseudo-
+    # oscillators of at most maxcells cells and period at most maxperiod,
+    # so that common pseudo-objects never need to be separated by
+    # separate_objects(). Each is built by placing a known strict object (in
+    # any phase and orientation) within two cells of another one, or of a
+    # smaller pseudo-object already built, and is kept if the parts never
+    # interact. A union which can be built from two different sets of parts
+    # (such as two blocks on lock) is ambiguous, so isn't seeded; any such
+    # union met in a soup is left to separate_objects().
+    def seed_pseudo_objects(self, maxcells, maxperiod):
+
+        # Pseudo-objects are counted as themselves in pseudo searches:
+        if (self.pseudo or self.already_seeded("p", maxcells, maxperiod)):
+            return
+
+        transitions = self.rg.transitiontable()
+
+        # The strict objects which are already known, with their phases:
+        strict = []
+        strictkeys = set()
+        for apgcode, listofobjs in self.decompositions.items():
+            if ((listofobjs != [apgcode]) or (apgcode[:2] not in ["xs", "xp"])):
+                continue
+            try:
+                period = apgcode_period(apgcode)
+            except ValueError:
+                continue
+            celllist = decode_apgcode(apgcode)
+            if ((period > maxperiod) or (len(celllist) // 2 >= maxcells)):
+                continue
+            phases = [frozenset([(celllist[i], celllist[i+1]) for i in range(0, len(celllist), 2)])]
+            for t in range(period - 1):
+                phases.append(frozenset(evolve(phases[-1], transitions)))
+            # Every orientation, starting from every phase:
+            orientedb = []
+            for k in range(period):
+                for sequence in oriented_phases(phases[k:] + phases[:k]):
+                    if sequence not in orientedb:
+                        orientedb.append(sequence)
+            strict.append((apgcode, phases, orientedb))
+            strictkeys.add(min([shape_key(cell_list(cells), *cell_rect(cells)) for cells in phases]))
+
+        # A dict mapping the least shape key of each union to its parts and
+        # phases, or to None if it has more than one decomposition:
+        found = {}
+        level = [([apgcode], phases) for (apgcode, phases, orientedb) in strict]
+
+        while (len(level) > 0):
+
+            nextlevel = []
+
+            for (parts, phasesa) in level:
+
+                (left, top, width, height) = cell_rect(phasesa[0])
+                halo = set([(x + dx, y + dy) for (x, y) in phasesa[0] for dx in range(-2, 3) for dy in range(-2, 3)])
+
+                for (apgcode, phasesb, orientedb) in strict:
+
+                    if ((len(phasesa[0]) + len(phasesb[0]) > maxcells) or
+                        (len(phasesa) * len(phasesb) // math.gcd(len(phasesa), len(phasesb)) > maxperiod)):
+                        continue
+
+                    for sequence in orientedb:
+                        (bwidth, bheight) = cell_rect(sequence[0])[2:]
+                        for dx in range(left - bwidth - 1, left + width + 2):
+                            for dy in range(top - bheight - 1, top + height + 2):
+                                placed = frozenset([(x + dx, y + dy) for (x, y) in sequence[0]])
+                                if ((len(placed & phasesa[0]) > 0) or (len(placed & halo) == 0)):
+                                    continue
+                                shifted = [placed] + [frozenset([(x + dx, y + dy) for (x, y) in cells]) for cells in sequence[1:]]
+                                union = disjoint_union(phasesa, shifted, transitions)
+                                if union is None:
+                                    continue
+                                key = min([shape_key(cell_list(cells), *cell_rect(cells)) for cells in union])
+                                newparts = sorted(parts + [apgcode])
+                                if key not in found:
+                                    found[key] = None if (key in strictkeys) else (newparts, union)
+                                    nextlevel.append((key, newparts, union))
+                                elif ((found[key] is not None) and (found[key][0] != newparts)):
+                                    found[key] = None
+
+            # Ambiguous unions aren't extended any further:
+            level = [(parts, union) for (key, parts, union) in nextlevel if found[key] is not None]
+            g.show("Seeding cache: " + str(len(found)) + " pseudo-objects found with up to " + str(maxcells) + " cells...")
+
+        for key, value in found.items():
+            if value is None:
+                continue
+            (parts, union) = value
+            shapekey = shape_key(cell_list(union[0]), *cell_rect(union[0]))
+            if ((shapekey in self.cache) and (self.cache[shapekey] in self.decompositions)):
+                continue
+            canonised = canonise_cells([cell_list(cells) for cells in union])
+            if (canonised == "#"):
+                continue
+            if (len(union) == 1):
+                descriptor = "xs" + str(len(union[0])) + "_" + canonised
+            else:
+                descriptor = "xp" + str(len(union)) + "_" + canonised
+            # Objects already met in soups keep the decomposition found then:
+            if descriptor in self.decompositions:
+                continue
+            self.setdecomposition(descriptor, parts)
+            self.decompositions.seed(descriptor, parts)
+            for cells in union:
+                shapekey = shape_key(cell_list(cells), *cell_rect(cells))
+                self.setcache(shapekey, descriptor)
+                self.cache.seed(shapekey, descriptor)
+
+        self.mark_seeded("p", maxcells, maxperiod)
+
+    # Empties the list of unidentified objects, grouping together copies of
+    # the same object (which have the same shape key):
+    def group_unids(self):
+
+        groups = {}
+        grouplist = []
+
+        for shapekey, livecells, x, y in self.unids:
+            if shapekey not in groups:
+                groups[shapekey] = []
+                grouplist.append(groups[shapekey])
+            groups[shapekey].append((shapekey, livecells, x, y))
+
+        self.unids = []
+
+        return grouplist
+
+    # Adds an object identified by process_unid to the census:
+    def credit_unid(self, unidname, soupid):
+
+        if ((unidname[0] == 'U') & (unidname[1] == 'S') & (unidname[2] == 'S')):
+
+            # Union of standard spaceships:
+            countlist = unidname.split('_')
+
+            for i in range(int(float(countlist[1]))):
+                self.creditobject(soupid, "xq4_6frc")
+
+            for i in range(int(float(countlist[2]))):
+                self.creditobject(soupid, "xq4_27dee6")
+
+            for i in range(int(float(countlist[3]))):
+                self.creditobject(soupid, "xq4_27deee6")
+
+        elif self.decomposable(unidname):
+            self.enter_unid(unidname, soupid, (unidname[1] == 'q'))
+        else:
+            self.creditobject(soupid, unidname)
+
+    # Still-lifes, oscillators and low-period (<= 9) non-standard spaceships
+    # are separated into their constituent parts by enter_unid():
+    def decomposable(self, unidname):
+
+        if ((unidname[0] == 'x') & ((unidname[1] == 's') | (unidname[1] == 'p'))):
+            return True
+
+        return ((unidname[0] == 'x') & (unidname[1] == 'q') & (unidname[3] == '_'))
 
     # This function has lots of arguments (hence the name):
     #
-    # @param gsize     the square-root of the number of soups per page
-    # @param gspacing  the minimum distance between centres of soups
-    # @param ashes     a list of cell lists
+    # @param ashes     a list of [soupid, celllist, rect, stepsize] lists
+    # @param margin    the number of empty cells to leave around each ash
     # @param stepsize  binary logarithm of amount of time to coalesce objects
     # @param intergen  binary logarithm of amount of time to run HashLife
-    # @param pos       the index of the first soup on the page
-    def teenager(self, gsize, gspacing, ashes, stepsize, intergen, pos):
+    def teenager(self, ashes, margin, stepsize, intergen):
 
         # For error-correction:
         if (intergen > 0):
             g.setalgo("HashLife")
             g.setrule(self.rg.slashed)
 
-        # If this gets incremented, we panic and perform error-correction:
-        pathological = 0
+        # If this is non-empty, we panic and perform error-correction on
+        # the soups listed:
+        pathological = []
 
-        # Draw the soups:
-        for i in range(gsize * gsize):
+        # Draw the soups, remembering where each one was placed:
+        offsets, self.placement = pack_ashes(ashes, margin)
 
-            x = int(i % gsize)
-            y = int(i / gsize)
+        for i in range(len(ashes)):
 
-            g.putcells(ashes[3*i], gspacing * x, gspacing * y)
+            g.putcells(ashes[i][1], offsets[i][0], offsets[i][1])
 
         # Because why not?
         g.fit()
@@ -3684,7 +5124,8 @@ class Soup:
         # Apply rules to coalesce objects and expunge annoyances such as
         # blocks, blinkers, beehives and gliders:
         start_time = time.time()
-        self.census(stepsize)
+        for obj, count in self.census(stepsize).items():
+            self.incobject(obj, count)
         end_time = time.time()
         self.ruletime += (end_time - start_time)
 
@@ -3695,45 +5136,37 @@ class Soup:
         if (len(celllist) > 2):
             for i in range(0, len(celllist)-1, 3):
                 if (g.getcell(celllist[i], celllist[i+1]) != 0):
-                    self.gridobj(celllist[i], celllist[i+1], gsize, gspacing, pos)
-
-        # If we have leftover unidentified objects, attempt to canonise them:
-        while (len(self.unids) > 0):
-            ux = int(0.5 + float(self.unids[-2])/float(gspacing))
-            uy = int(0.5 + float(self.unids[-1])/float(gspacing))
-            soupid = ux + (uy * gsize) + pos
-            unidname = self.process_unid()
-            if (unidname == "PATHOLOGICAL"):
-                pathological += 1
-            if (unidname != "nothing"):
-
-                if ((unidname[0] == 'U') & (unidname[1] == 'S') & (unidname[2] == 'S')):
-                    
-                    # Union of standard spaceships:
-                    countlist = unidname.split('_')
-                    
-                    self.incobject("xq4_6frc", int(float(countlist[1])))
-
-                    for i in range(int(float(countlist[1]))):
-                        self.awardpoints2(soupid, "xq4_6frc")
-
-                    self.incobject("xq4_27dee6", int(float(countlist[2])))
-                    for i in range(int(float(countlist[2]))):
-                        self.awardpoints2(soupid, "xq4_27dee6")
-                        
-                    self.incobject("xq4_27deee6", int(float(countlist[3])))
-                    for i in range(int(countlist[3])):
-                        self.awardpoints2(soupid, "xq4_27deee6")
-                        
-                elif ((unidname[0] == 'x') & ((unidname[1] == 's') | (unidname[1] == 'p'))):
-                    self.enter_unid(unidname, soupid, False)
-                else:
-                    if ((unidname[0] == 'x') & (unidname[1] == 'q') & (unidname[3] == '_')):
-                        # Separates low-period (<= 9) non-standard spaceships in medium proximity:
-                        self.enter_unid(unidname, soupid, True)
-                    else:
-                        self.incobject(unidname, 1)
-                        self.awardpoints2(soupid, unidname)
+                    self.gridobj(celllist[i], celllist[i+1])
+
+        # If we have leftover unidentified objects, attempt to canonise them.
+        # Only the first copy of each distinct object is analysed, and the
+        # result is credited to the soup of every copy. The analysis is
+        # shared among any worker processes, and the results are credited in
+        # the same order as they would be otherwise:
+        groups = self.group_unids()
+        miss_time = time.time()
+        results = self.identify_unids([occurrences[0] for occurrences in groups])
+        self.cache.misstime += (time.time() - miss_time)
+
+        for occurrences, result in zip(groups, results):
+            shapekey, livecells, x, y = occurrences[0]
+            miss_time = time.time()
+            if result is None:
+                unidname = self.process_unid(shapekey, livecells, x, y)
+            elif (result[0] == -1):
+                unidname = self.process_unid(shapekey, livecells, x, y, result[2])
+            else:
+                unidname = self.name_unid(result, livecells, x, y)
+            self.cache.misstime += (time.time() - miss_time)
+
+            for shapekey, livecells, x, y in occurrences:
+                soupid = locate_soup(self.placement, x, y)
+                if (unidname == "PATHOLOGICAL"):
+                    pathological.append(soupid)
+                if ((unidname == "PATHOLOGICAL") | (unidname[0:3] == "ov_")):
+                    self.addsuperunid(livecells, x, y)
+                if (unidname != "nothing"):
+                    self.credit_unid(unidname, soupid)
 
         end_time = time.time()
         self.gridtime += (end_time - start_time)
@@ -3755,15 +5188,13 @@ class Soup:
     # This basically orchestrates everything:
     def stabilise_soups_parallel_orig(self, gsize, souplist, pos):
 
-        ashes = []
-        stepsize = 3
+        page_start = time.time()
+        queued = [0, 0, 0]
 
         g.new("Random soups")
         g.setalgo("QuickLife")
         g.setrule(self.rg.slashed)
 
-        gspacing = 0
-
         # Generate and run the soups until stabilisation:
         for i in range(gsize * gsize):
 
@@ -3778,72 +5209,225 @@ class Soup:
 
             # Run the soup until stabilisation:
             start_time = time.time()
-            stepsize = max(stepsize, self.stabilise3())
+            stepsize = self.stabilise3()
             end_time = time.time()
             self.qlifetime += (end_time - start_time)
 
             # Ironically, the spelling of this variable is incurrrect:
             currrect = g.getrect()
-            ashes.append(g.getcells(currrect))
 
+            # Empty ashes contribute nothing, so need not be censused:
             if (len(currrect) == 4):
-                ashes.append(currrect[0])
-                ashes.append(currrect[1])
-                # Choose the grid spacing based on the size of the ash:
-                gspacing = max(gspacing, 2*currrect[2])
-                gspacing = max(gspacing, 2*currrect[3])
+                ash = [pos + i, g.getcells(currrect), currrect, stepsize]
                 g.select(currrect)
                 g.clear(0)
-            else:
-                ashes.append(0)
-                ashes.append(0)
             g.select([])
 
-        # Account for any extra enlargement caused by running CoalesceObjects:
-        gspacing += 2 ** (stepsize + 1) + 1000
+            # Tiny ashes identical to earlier ones needn't go on a page:
+            if (len(currrect) == 4):
+                sizeclass = ash_size_class(currrect)
+                if ((sizeclass > 0) or (not self.memoised_ash(ash))):
+                    self.ashbuckets[sizeclass].append(ash)
+                    queued[sizeclass] += 1
 
         start_time = time.time()
 
-        # Remember the dictionary, just in case we have a pathological object:
-        prevdict = self.objectcounts.copy()
-        prevscores = self.soupscores.copy()
-        prevunids = self.superunids[:]
+        # Census any bucket which now has a full page of ashes:
+        for sizeclass in range(len(self.ashbuckets)):
+            if (len(self.ashbuckets[sizeclass]) >= gsize * gsize):
+                self.flush_ashes(sizeclass, gsize)
 
-        # Process the soups:
-        returncode = self.teenager(gsize, gspacing, ashes, stepsize, 0, pos)
+        # The census of a soup's ash may happen during a later call, so the
+        # soups are charged the mean census cost of each ash they queued, on
+        # the pages which this page size fills, rather than the time taken
+        # by whichever flushes happen now:
+        amortised = 0.0
+        for sizeclass in range(len(queued)):
+            amortised += queued[sizeclass] * self.census_cost(sizeclass, gsize)
 
-        end_time = time.time()
+        # Calculate the mean delay incurred per soup, including stabilisation:
+        meandelay = ((start_time - page_start) + amortised) / (gsize * gsize)
+
+        # Return the mean delay so that we can use machine-learning to
+        # find the optimal value of sqrtspp:
+        return meandelay
+
+    # Credits a tiny ash to its soup directly if an identical ash has been
+    # seen before, returning whether it has been dealt with. The second copy
+    # of an ash is censused on its own in a fresh universe, so that its
+    # contribution (including any objects removed by the census rules) can
+    # be told apart from those of other soups and remembered.
+    def memoised_ash(self, ash):
+
+        soupid, celllist, rect = ash[:3]
+        key = hashlib.md5(str([celllist[i] - rect[i % 2] for i in range(len(celllist))]).encode('utf-8')).digest()
+
+        contribution = self.ashmemo.get(key, False)
+
+        if (contribution is False):
+            self.ashmemo[key] = None
+            return False
+
+        if (contribution is True):
+            return False
+
+        if contribution is None:
+            start = len(self.journal)
+            stepsize = max(3, ash[3])
+
+            g.new("Memoising ash")
+            g.setalgo("QuickLife")
+            g.setrule(self.rg.slashed)
+            pathological = self.teenager([ash], 2 ** stepsize + ashpadding[0], stepsize, 0)
+            entries = self.journal[start:]
+
+            g.new("Random soups")
+            g.setalgo("QuickLife")
+            g.setrule(self.rg.slashed)
+
+            if (len(pathological) > 0):
+                # Leave this one, and every later copy, to error-correction
+                # on a page:
+                for entry in reversed(entries):
+                    self.undo(entry)
+                del self.journal[start:]
+                self.readmit_refused()
+                self.ashmemo[key] = True
+                return False
+
+            # Oversized and pathological objects are kept with the soup, so
+            # ashes containing them aren't remembered:
+            if (len([entry for entry in entries if (entry[1] == "superunid")]) == 0):
+                expunged = [(entry[2], entry[3]) for entry in entries if ((entry[1] == "object") and (entry[0] is None))]
+                credited = [entry[2] for entry in entries if ((entry[1] == "object") and (entry[0] is not None))]
+                self.ashmemo[key] = (expunged, credited)
+            else:
+                self.ashmemo[key] = True
+
+            return True
+
+        (expunged, credited) = contribution
+        for obj, count in expunged:
+            self.incobject(obj, count)
+        for obj in credited:
+            self.creditobject(soupid, obj)
+
+        return True
+
+    # Returns the mean time taken to census an ash of a size class on the
+    # pages filled by gsize * gsize soups at a time, or over all pages if
+    # none of those have been censused yet:
+    def census_cost(self, sizeclass, gsize):
+
+        (censustime, censusashes) = self.pagecensus.get((sizeclass, gsize), [0.0, 0])
+
+        if (censusashes == 0):
+            (censustime, censusashes) = (self.censustime[sizeclass], self.censusashes[sizeclass])
+
+        return (censustime / censusashes) if (censusashes > 0) else 0.0
+
+    # Performs a census of the ashes waiting in one size-class bucket (or
+    # in every bucket, if sizeclass is None). This must be called before
+    # the census is saved, so that no soups are left uncounted. A flush
+    # caused by a full page of gsize * gsize soups records its cost against
+    # that page size:
+    def flush_ashes(self, sizeclass=None, gsize=None):
+
+        if sizeclass is None:
+            for sizeclass in range(len(self.ashbuckets)):
+                self.flush_ashes(sizeclass)
+            return
+
+        ashes = self.ashbuckets[sizeclass]
+        self.ashbuckets[sizeclass] = []
+
+        if (len(ashes) == 0):
+            return
 
-        # Calculate the mean delay incurred (excluding qlifetime or error-correction):
-        meandelay = (end_time - start_time) / (gsize * gsize)
+        # Start with the objects identified by previous runs:
+        if not self.cacheloaded:
+            self.load_cache()
 
-        if (returncode > 0):
+        start_time = time.time()
+        censused = len(ashes)
+        self.censusashes[sizeclass] += censused
+
+        g.new("Census page")
+        g.setalgo("QuickLife")
+        g.setrule(self.rg.slashed)
+
+        stepsize = max([3] + [ash[3] for ash in ashes])
+
+        # Account for any extra enlargement caused by running CoalesceObjects.
+        # The rare huge ashes keep the original 1000-cell gap between them,
+        # whereas pages of tiny ashes can be packed much more tightly:
+        margin = 2 ** stepsize + ashpadding[sizeclass]
+
+        # Process the soups:
+        pathological = self.teenager(ashes, margin, stepsize, 0)
+
+        if (len(pathological) > 0):
             if (self.skipErrorCorrection == False):
                 # Arrrggghhhh, there's a pathological object! Usually this means
                 # that naive stabilisation detection returned a false positive.
                 self.resets += 1
-                
-                # Reset the object counts:
-                self.objectcounts = prevdict
-                self.soupscores = prevscores
-                self.superunids = prevunids
+
+                # Only the affected soups need to be rerun; the rest of the
+                # page keeps its results:
+                ashes = [ash for ash in ashes if ash[0] in pathological]
+                self.rollback_soups(ashes, margin, stepsize)
 
                 # 2^18 generations should suffice. This takes about 30 seconds in
-                # HashLife, but error-correction only occurs very infrequently, so
-                # this has a negligible impact on mean performance:
-                gspacing += 2 ** 19
+                # HashLife per page, but error-correction only occurs very
+                # infrequently and now only involves one or two soups, so this
+                # has a negligible impact on mean performance:
+                margin += 2 ** 18
                 stepsize = max(stepsize, 12)
                 
                 # Clear the universe:
                 g.new("Error-correcting phase")
-                self.teenager(gsize, gspacing, ashes, stepsize, 18, pos)
+                self.teenager(ashes, margin, stepsize, 18)
+
+        self.commit_journal()
+        self.save_cache()
+        self.sync_shared_cache()
+
+        elapsed = time.time() - start_time
+        self.censustime[sizeclass] += elapsed
+        if gsize is not None:
+            pagecensus = self.pagecensus.setdefault((sizeclass, gsize), [0.0, 0])
+            pagecensus[0] += elapsed
+            pagecensus[1] += censused
 
         # Erase any ashes. Not least because England usually loses...
         ashes = []
 
-        # Return the mean delay so that we can use machine-learning to
-        # find the optimal value of sqrtspp:
-        return meandelay
+    # Removes everything that the current page added to the census on
+    # behalf of the given ashes.
+    def rollback_soups(self, ashes, margin, stepsize):
+
+        soupids = set([ash[0] for ash in ashes])
+
+        # Undo the journalled changes made by these soups, latest first:
+        kept = []
+        for entry in reversed(self.journal):
+            if entry[0] in soupids:
+                self.undo(entry)
+            else:
+                kept.append(entry)
+        kept.reverse()
+        self.journal = kept
+        self.readmit_refused()
+
+        # Objects expunged by the census rules cannot be attributed to soups,
+        # so recount them by censusing these ashes on their own:
+        g.new("Rolling back")
+        g.setalgo("QuickLife")
+        offsets, placement = pack_ashes(ashes, margin)
+        for i in range(len(ashes)):
+            g.putcells(ashes[i][1], offsets[i][0], offsets[i][1])
+        for obj, count in self.census(stepsize).items():
+            self.decobject(obj, count)
 
     def reset(self):
 
@@ -3852,28 +5436,197 @@ class Soup:
         self.alloccur = {}
         self.superunids = []
         self.unids = []
+        self.ashbuckets = [[], [], []]
+        self.journal = []
+
+    # Analyses the given unidentified objects in the worker processes, if
+    # there are any, and then whatever they didn't finish all together in one
+    # Golly universe. Returns a list of the results of identify_cells(), in
+    # the same order, where None means that the object is left to
+    # process_unid(). A period of -1 means that the object was found growing,
+    # and it is left to process_unid() together with its populations:
+    def identify_unids(self, unids):
+
+        if ((self.unidworkers == 0) or (len(unids) < 2)):
+            identified = [None] * len(unids)
+        else:
+            identified = self.run_unid_pool(unids)
+
+        # Objects no worker answered for, such as those of a worker which
+        # died, are run by batch_bijoscar() rather than one by one:
+        missing = [i for i in range(len(unids)) if identified[i] is None]
+        results = self.batch_bijoscar([unids[i][1] for i in missing])
+        for (i, result) in zip(missing, results):
+            identified[i] = result
+
+        # Unions of standard spaceships are recognised by process_unid():
+        return [(None if ((result is None) or (result[0] == -4)) else result) for result in identified]
+
+    # Shares the given unidentified objects among the worker processes,
+    # starting them if need be. Returns the result of identify_cells() for
+    # each object, or None for any which the workers didn't finish:
+    def run_unid_pool(self, unids):
+
+        if self.unidpool is None:
+            self.start_unid_pool()
+            if self.unidpool is None:
+                return [None] * len(unids)
+
+        (tasks, results, workers, feeders) = self.unidpool
+        transitions = tuple(self.rg.transitiontable())
 
-    # Pop the last unidentified object from the stack, and attempt to
-    # ascertain its period and classify it.
-    def process_unid(self):
+        for (index, (shapekey, livecells, x, y)) in enumerate(unids):
+            tasks.put((index, (livecells, transitions)))
+
+        identified = [None] * len(unids)
+        remaining = len(unids)
+        deadline = time.time() + self.unidtimeout
+
+        while (remaining > 0):
+            try:
+                (index, result) = results.get(timeout=1.0)
+            except queue.Empty:
+                # A worker which has died (at the hands of the out-of-memory
+                # killer, say) will never answer, so the pool is replaced
+                # and whatever is missing is left to batch_bijoscar():
+                if ((time.time() > deadline) or (not all([feeder.is_alive() for feeder in feeders]))):
+                    self.close_unid_pool()
+                    break
+                continue
+            identified[index] = result
+            remaining -= 1
+
+        return identified
+
+    # Starts unidworkers worker processes, each with a thread in this process
+    # which feeds it objects. The workers are separate Python processes (see
+    # unidworkerprogram) rather than forks of Golly, which has threads of its
+    # own. Where no Python interpreter can be found or started, unidworkers
+    # is set to 0 and everything is analysed in Golly:
+    def start_unid_pool(self):
+
+        interpreter = python_interpreter()
+        if interpreter is None:
+            self.unidworkers = 0
+            return
+
+        namespace = pickle.dumps(worker_namespace(unid_worker))
+        command = [interpreter, "-c", unidworkerprogram, sys.implementation.cache_tag]
+        tasks = queue.Queue()
+        results = queue.Queue()
+        workers = []
+        feeders = []
+
+        try:
+            for i in range(self.unidworkers):
+                workers.append(subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)))
+                workers[-1].stdin.write(namespace)
+                workers[-1].stdin.flush()
+            for worker in workers:
+                pickle.load(worker.stdout)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # The interpreter is of another version of Python, say:
+            for worker in workers:
+                worker.kill()
+                worker.wait()
+            self.unidworkers = 0
+            return
+
+        for worker in workers:
+            feeders.append(threading.Thread(target=feed_unid_worker, args=(worker, tasks, results), daemon=True))
+            feeders[-1].start()
+
+        self.unidpool = (tasks, results, workers, feeders)
+
+    # Stops the worker processes, if they have been started:
+    def close_unid_pool(self):
+
+        if self.unidpool is None:
+            return
+
+        (tasks, results, workers, feeders) = self.unidpool
+        self.unidpool = None
+
+        # Objects which haven't been started on are abandoned:
+        try:
+            while True:
+                tasks.get_nowait()
+        except queue.Empty:
+            pass
+
+        for feeder in feeders:
+            tasks.put(None)
+        for feeder in feeders:
+            feeder.join(1.0)
+
+        # A worker stops when its input ends, and one which is still busy
+        # is killed (which also frees its feeder):
+        for worker in workers:
+            try:
+                worker.stdin.close()
+            except (OSError, ValueError):
+                pass
+            try:
+                worker.wait(1.0)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+                worker.wait()
+        for feeder in feeders:
+            feeder.join()
+        for worker in workers:
+            worker.stdout.close()
+
+    # Names an object identified by a worker process, and caches every phase.
+    # The object is placed in the universe if enter_unid() will need it:
+    def name_unid(self, result, livecells, x, y):
+
+        (period, canonised, shapekeys) = result
+        descriptor = make_apgcode(period, len(livecells) // 2, canonised)
+
+        for shapekey in shapekeys:
+            self.setcache(shapekey, descriptor)
+
+        if (self.decomposable(descriptor) and (descriptor not in self.decompositions)):
+            g.new("Unidentified object")
+            g.setalgo("QuickLife")
+            g.setrule(self.rg.slashed)
+            g.putcells(livecells, -x, -y, 1, 0, 0, 1, "or")
+
+        return descriptor
+
+    # Attempt to ascertain the period of an unidentified object and classify
+    # it. The object is left in the universe, for use by enter_unid().
+    def process_unid(self, shapekey, livecells, x, y, populations=None):
 
         g.new("Unidentified object")
         g.setalgo("QuickLife")
         g.setrule(self.rg.slashed)
-        y = self.unids.pop()
-        x = self.unids.pop()
-        livecells = self.unids.pop()
-        bitstring = self.unids.pop()
         g.putcells(livecells, -x, -y, 1, 0, 0, 1, "or")
-        period = self.bijoscar(1000)
+
+        if populations is not None:
+            # batch_bijoscar() has already run the object for 1000 generations
+            # without it repeating, so we need only catch up with it:
+            g.run(1000)
+            period = -1
+        else:
+            populations = []
+            period = self.bijoscar(1000, populations)
         
         if (period == -1):
-            # Infinite growth pattern, probably. Most infinite-growth
-            # patterns are linear-growth (such as puffers, wickstretchers,
-            # guns etc.) so we analyse to see whether we have a linear-
-            # growth pattern:
+            # Infinite growth pattern, probably. This exact pattern may
+            # well have been classified before:
+            signature = growth_signature(shapekey, populations)
+            descriptor = self.growthmemo.get(signature)
+            if descriptor is not None:
+                return descriptor
+
+            # Most infinite-growth patterns are linear-growth (such as
+            # puffers, wickstretchers, guns etc.) so we analyse to see
+            # whether we have a linear-growth pattern:
             descriptor = linearlyse(1500)
             if (descriptor[0] == "y"):
+                self.setgrowth(signature, descriptor)
                 return descriptor
 
             # Similarly check for irregular power-law growth. This will
@@ -3881,6 +5634,7 @@ class Soup:
             # generations; this seems like a reasonable amount of time.
             descriptor = powerlyse(8, 1500)
             if (descriptor[0] == "z"):
+                self.setgrowth(signature, descriptor)
                 return descriptor
 
             # It may be an unstabilised ember that slipped through the net,
@@ -3888,10 +5642,6 @@ class Soup:
             # persists another 2^18 gens, which is so unbelievably improbable
             # that you are more likely to be picked up by a passing ship in
             # the vacuum of space).
-            self.superunids.append(livecells)
-            self.superunids.append(x)
-            self.superunids.append(y)
-            
             return "PATHOLOGICAL"
         elif (period == 0):
             return "nothing"
@@ -3911,12 +5661,10 @@ class Soup:
             if (canonised == "#"):
 
                 # Okay, we know that it's an oscillator or spaceship with
-                # a non-astronomical period. But it's too large to canonise
-                # in any of its phases (i.e. transcends a 40-by-40 box).
-                self.superunids.append(livecells)
-                self.superunids.append(x)
-                self.superunids.append(y)
-                
+                # a non-astronomical period. But it can't be canonised (this
+                # no longer happens for large objects, which are canonised
+                # in their best phase of any size).
+
                 # Append a suffix according to whether it is a still-life,
                 # oscillator or moving object:
                 if (period == 1):
@@ -3932,18 +5680,441 @@ class Soup:
 
                 # Prepend a prefix according to whether it is a still-life,
                 # oscillator or moving object:
-                if (period == 1):
-                    descriptor = ("xs"+str(int(len(livecells)/2))+"_"+canonised)
-                elif (period > 0):
-                    descriptor = ("xp"+str(int(period))+"_"+canonised)
-                else:
-                    descriptor = ("xq"+str(int(0-period))+"_"+canonised)
+                descriptor = make_apgcode(period, len(livecells) // 2, canonised)
 
-                if (bitstring > 0):
-                    self.cache[bitstring] = descriptor
+                # Later copies may appear in any phase, so cache them all:
+                self.cache_phases(period, descriptor)
 
                 return descriptor
 
+    # Enters an object into the cache, and queues it to be saved to disk:
+    def setcache(self, shapekey, descriptor):
+
+        if ((shapekey not in self.cache) or (self.cache[shapekey] != descriptor)):
+            self.cache[shapekey] = descriptor
+            self.pendingcache.append("c %d %d %x %s\n" % (shapekey[0], shapekey[1], shapekey[2], descriptor))
+
+    # Memoizes a decomposition, and queues it to be saved to disk:
+    def setdecomposition(self, unidname, listofobjs):
+
+        self.decompositions[unidname] = listofobjs
+        self.pendingcache.append("d " + unidname + " " + " ".join(listofobjs) + "\n")
+
+    # Memoizes the classification of an infinite-growth pattern, and queues
+    # it to be saved to disk:
+    def setgrowth(self, signature, descriptor):
+
+        self.growthmemo[signature] = descriptor
+        self.pendingcache.append("g " + signature + " " + descriptor + "\n")
+
+    # Returns the path of the on-disk cache for this rule and mode:
+    def cachepath(self):
+
+        if self.cachedir is None:
+            dirname = g.getdir("data")
+            separator = dirname[-1]
+            cachedir = dirname + "apgsearch" + separator + "cache" + separator
+        else:
+            cachedir = self.cachedir
+
+        mode = "pseudo" if self.pseudo else "standard"
+
+        return os.path.join(cachedir, self.rg.alphanumeric + "_" + mode + ".txt")
+
+    # Loads the on-disk cache for this rule and mode. The file is only ever
+    # appended to, so a line left incomplete by a crash is simply ignored:
+    def load_cache(self):
+
+        self.cacheloaded = True
+        filename = self.cachepath()
+
+        if os.path.exists(filename):
+            try:
+                f = open(filename, 'r')
+                lines = f.readlines()
+                f.close()
+            except:
+                g.warn("Unable to read cache file:\n" + filename)
+                lines = []
+
+            keys = set()
+            for line in lines:
+                self.read_cache_line(line)
+                keys.add(cache_line_key(line))
+
+            # Several instances appending the same objects will leave duplicate
+            # lines behind, so rewrite the file once it is mostly duplicates:
+            if (len(lines) > 2 * len(keys) + 1000):
+                self.compact_cache()
+
+        if (self.sharecache and (shared_memory is not None)):
+            self.share_cache()
+
+    # Enters one line of the on-disk cache into memory, returning the key
+    # and value to share with other instances (or None if the line is
+    # invalid, or is of no use to them):
+    def read_cache_line(self, line):
+
+        fields = line.split()
+        if ((len(fields) < 3) or (line[-1] != "\n")):
+            return None
+        try:
+            if ((fields[0] == "c") and (len(fields) == 5)):
+                shapekey = (int(fields[1]), int(fields[2]), int(fields[3], 16))
+                self.cache[shapekey] = fields[4]
+                return ("c %d %d %x" % shapekey, fields[4])
+            elif (fields[0] == "d"):
+                self.decompositions[fields[1]] = fields[2:]
+                return ("d " + fields[1], " ".join(fields[2:]))
+            elif ((fields[0] == "g") and (len(fields) == 3)):
+                self.growthmemo[fields[1]] = fields[2]
+                return ("g " + fields[1], fields[2])
+            elif ((fields[0] == "i") and (len(fields) == 3)):
+                self.importedcensuses[fields[1]] = fields[2]
+                return None
+            elif ((fields[0] in ["s", "p"]) and (len(fields) == 3)):
+                self.seededto[fields[0]] = (int(fields[1]), int(fields[2]))
+                return None
+        except ValueError:
+            pass
+
+        return None
+
+    # Attaches to the shared table for this rule and mode, creating it (and
+    # filling it with the contents of memory) if this is the first instance:
+    def share_cache(self):
+
+        name = "apg_" + hashlib.md5(self.cachepath().encode('utf-8')).hexdigest()[:16]
+
+        try:
+            self.sharedcache = SharedCache(name)
+        except (OSError, ValueError):
+            return
+
+        self.cache.fallback = self.shared_object
+        self.decompositions.fallback = self.shared_decomposition
+        self.growthmemo.fallback = self.shared_growth
+
+        if self.sharedcache.writer:
+            for shapekey, descriptor in self.cache.items():
+                self.sharedcache.put("c %d %d %x" % shapekey, descriptor)
+            for unidname, listofobjs in self.decompositions.items():
+                self.sharedcache.put("d " + unidname, " ".join(listofobjs))
+            for signature, descriptor in self.growthmemo.items():
+                self.sharedcache.put("g " + signature, descriptor)
+            self.sync_shared_cache()
+
+    # Releases the resources shared with other processes. This must be
+    # called once a search ends, however it ends:
+    def close(self):
+
+        self.close_unid_pool()
+
+        if self.sharedcache is not None:
+            self.sharedcache.close()
+            self.sharedcache = None
+            self.cache.fallback = None
+            self.decompositions.fallback = None
+            self.growthmemo.fallback = None
+
+    # Looks up shape keys, decompositions and growth in the shared table:
+    def shared_object(self, shapekey):
+
+        return self.sharedcache.get("c %d %d %x" % shapekey)
+
+    def shared_decomposition(self, unidname):
+
+        listofobjs = self.sharedcache.get("d " + unidname)
+
+        return None if listofobjs is None else listofobjs.split()
+
+    def shared_growth(self, signature):
+
+        return self.sharedcache.get("g " + signature)
+
+    # The other instances append the objects they identify to the on-disk
+    # cache, so the writer follows the end of that file into the table:
+    def sync_shared_cache(self):
+
+        if ((self.sharedcache is None) or (not self.sharedcache.writer)):
+            return
+
+        filename = self.cachepath()
+
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return
+
+        # The file has been compacted, so start again from the beginning:
+        if (((stat.st_dev, stat.st_ino) != self.cachefileid) or (stat.st_size < self.cachefileoffset)):
+            self.cachefileid = (stat.st_dev, stat.st_ino)
+            self.cachefileoffset = 0
+
+        if (stat.st_size == self.cachefileoffset):
+            return
+
+        try:
+            f = open(filename, 'rb')
+            f.seek(self.cachefileoffset)
+            data = f.read()
+            f.close()
+        except:
+            return
+
+        # Leave any line still being written for next time:
+        data = data[:data.rfind(b"\n") + 1]
+        self.cachefileoffset += len(data)
+
+        for line in data.decode('utf-8', 'replace').splitlines(True):
+            entry = self.read_cache_line(line)
+            if entry is not None:
+                self.sharedcache.put(entry[0], entry[1])
+
+    # Takes an exclusive lock on the on-disk cache (where the platform has
+    # file locks), so that no lines are appended while it is compacted.
+    # Returns the lock file, which is passed to unlock_cache():
+    def lock_cache(self):
+
+        if fcntl is None:
+            return None
+
+        try:
+            lockfile = open(self.cachepath() + ".lock", 'a')
+        except (OSError, IOError):
+            return None
+
+        fcntl.flock(lockfile, fcntl.LOCK_EX)
+        return lockfile
+
+    def unlock_cache(self, lockfile):
+
+        if lockfile is not None:
+            fcntl.flock(lockfile, fcntl.LOCK_UN)
+            lockfile.close()
+
+    # Atomically replaces the on-disk cache with a copy holding only the
+    # latest line for each key. This is made from the file itself, not from
+    # memory, so that entries evicted from memory aren't lost:
+    def compact_cache(self):
+
+        self.save_cache()
+
+        filename = self.cachepath()
+        tempname = filename + "." + str(os.getpid()) + ".tmp"
+
+        if not os.path.exists(filename):
+            return
+
+        lockfile = self.lock_cache()
+
+        try:
+            f = open(filename, 'r')
+            lines = f.readlines()
+            f.close()
+
+            latest = collections.OrderedDict()
+            for line in lines:
+                key = cache_line_key(line)
+                if key is not None:
+                    latest.pop(key, None)
+                    latest[key] = line
+
+            f = open(tempname, 'w')
+            f.write("".join(latest.values()))
+            f.close()
+            os.replace(tempname, filename)
+        except:
+            g.warn("Unable to rewrite cache file:\n" + filename)
+        finally:
+            self.unlock_cache(lockfile)
+
+    # Appends any newly-cached objects to the on-disk cache:
+    def save_cache(self):
+
+        if (len(self.pendingcache) == 0):
+            return
+
+        filename = self.cachepath()
+
+        try:
+            if not os.path.exists(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+        except:
+            g.warn("Unable to write cache file:\n" + filename)
+            return
+
+        lockfile = self.lock_cache()
+
+        try:
+            # A single write, so that concurrent instances don't interleave:
+            f = open(filename, 'a')
+            f.write("".join(self.pendingcache))
+            f.close()
+        except:
+            g.warn("Unable to write cache file:\n" + filename)
+        finally:
+            self.unlock_cache(lockfile)
+
+        self.pendingcache = []
+
+    # Seeds the cache from the census files on this machine: progress files
+    # written by save_progress(), and text censuses downloaded from Catagolue
+    # and saved as apgsearch/censuses/<rule>/<symmetry>.txt in the Golly data
+    # directory. Only censuses of the same rule, and of pseudo symmetries if
+    # and only if this is a pseudo search, are read. Files are remembered in
+    # the on-disk cache, and only read again once they change; of the
+    # objects they list, only the maxobjects commonest are imported. Returns
+    # the number of objects imported.
+    def import_censuses(self, maxobjects):
+
+        dirname = g.getdir("data")
+        separator = dirname[-1]
+        progresspath = dirname + "apgsearch" + separator + "progress" + separator
+        censuspath = dirname + "apgsearch" + separator + "censuses" + separator + self.rg.alphanumeric + separator
+
+        censuses = []
+
+        if os.path.isdir(progresspath):
+            for filename in sorted(os.listdir(progresspath)):
+                if (filename.startswith("search_") and filename.endswith(".txt")):
+                    censuses.append((progresspath + filename, None))
+
+        if os.path.isdir(censuspath):
+            for filename in sorted(os.listdir(censuspath)):
+                if (filename.endswith(".txt") or filename.endswith(".csv")):
+                    censuses.append((censuspath + filename, filename[:-4]))
+
+        counts = {}
+
+        for (filename, symmetry) in censuses:
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            digest = hashlib.md5(filename.encode('utf-8')).hexdigest()
+            stamp = "%d_%d" % (stat.st_size, int(stat.st_mtime))
+            if (self.importedcensuses.get(digest) == stamp):
+                continue
+            self.read_census(filename, symmetry, counts)
+            self.importedcensuses[digest] = stamp
+            self.pendingcache.append("i " + digest + " " + stamp + "\n")
+
+        # Commonest objects last, so that they are the last to be evicted:
+        commonest = sorted(iter(counts.items()), key=operator.itemgetter(1))[-maxobjects:]
+        imported = 0
+        for apgcode, count in commonest:
+            if self.import_object(apgcode):
+                imported += 1
+                if (imported % 100 == 0):
+                    g.show("Importing censuses: " + str(imported) + " objects verified...")
+
+        self.save_cache()
+
+        return imported
+
+    # Adds the object counts of a census file to the counts dict. Progress
+    # files give their own rule and symmetry; text censuses (in Catagolue's
+    # "apgcode","occurrences" format) are given the symmetry by the caller:
+    def read_census(self, filename, symmetry, counts):
+
+        try:
+            f = open(filename, 'r')
+            lines = f.readlines()
+            f.close()
+        except:
+            g.warn("Unable to read census file:\n" + filename)
+            return
+
+        incensus = (symmetry is not None)
+        filecounts = {}
+
+        for line in lines:
+            line = line.strip()
+            if (line[:6] == "@RULE "):
+                if (line[6:] != self.rg.alphanumeric):
+                    return
+            elif (line[:10] == "@SYMMETRY "):
+                symmetry = line[10:]
+            elif (line == "@CENSUS TABLE"):
+                incensus = True
+            elif ((len(line) == 0) or (line[0] == "@")):
+                incensus = False
+            elif incensus:
+                fields = line.replace('"', '').replace(',', ' ').split()
+                if ((len(fields) == 2) and fields[1].isdigit()):
+                    filecounts[fields[0]] = filecounts.get(fields[0], 0) + int(fields[1])
+
+        # Pseudo-objects would be wrongly decomposed into themselves in a
+        # search for strict objects, and vice versa:
+        if ((symmetry is None) or ((symmetry.lower().count('pseudo') > 0) != self.pseudo)):
+            return
+
+        for apgcode, count in filecounts.items():
+            counts[apgcode] = counts.get(apgcode, 0) + count
+
+    # Verifies a still-life, oscillator or spaceship from a census by
+    # running it through a full period in-process, and caches every phase.
+    # Objects in a census are already decomposed, so each one is its own
+    # decomposition. Returns whether the object was newly imported:
+    def import_object(self, apgcode):
+
+        if ((apgcode[:2] not in ["xs", "xp", "xq"]) or (apgcode.find('_') < 3) or (apgcode in self.apgcodetorle)):
+            return False
+
+        try:
+            period = apgcode_period(apgcode)
+        except ValueError:
+            return False
+
+        celllist = decode_apgcode(apgcode)
+        cells = set([(celllist[i], celllist[i+1]) for i in range(0, len(celllist), 2)])
+        if ((period < 1) or (len(cells) == 0)):
+            return False
+
+        shapekey = shape_key(celllist, *cell_rect(cells))
+
+        self.apgcodetorle[apgcode] = cells_to_rle(celllist, self.rg.slashed)
+
+        # Already known from the on-disk cache:
+        if ((shapekey in self.cache) and (self.cache[shapekey] == apgcode) and (apgcode in self.decompositions)):
+            return False
+
+        transitions = self.rg.transitiontable()
+        phases = [cells]
+        for t in range(period):
+            phases.append(evolve(phases[-1], transitions))
+
+        # A spaceship only needs to return to the same shape:
+        if ((apgcode[1] == 'q') and (len(phases[-1]) > 0)):
+            left, top = cell_rect(phases[0])[:2]
+            left2, top2 = cell_rect(phases[-1])[:2]
+            phases[-1] = set([(x - left2 + left, y - top2 + top) for (x, y) in phases[-1]])
+        if (phases[-1] != phases[0]):
+            del self.apgcodetorle[apgcode]
+            return False
+
+        if apgcode not in self.decompositions:
+            self.setdecomposition(apgcode, [apgcode])
+
+        for cells in phases[:-1]:
+            self.setcache(shape_key(cell_list(cells), *cell_rect(cells)), apgcode)
+
+        return True
+
+    # Runs the object in the universe through one full period, entering the
+    # shape key of every phase into the cache. Each shape key covers all
+    # eight orientations of that phase. The universe is left in the same
+    # phase as it started (although spaceships will have moved).
+    def cache_phases(self, period, descriptor):
+
+        for t in range(abs(period)):
+
+            rect = g.getrect()
+            self.setcache(shape_key(g.getcells(rect), rect[0], rect[1], rect[2], rect[3]), descriptor)
+
+            g.run(1)
+
     # This doesn't really do much, since unids should be empty and
     # actual pathological/oversized objects will rarely arise naturally.
     def display_unids(self):
@@ -3979,6 +6150,9 @@ class Soup:
     # Saves a machine-readable textual file containing the census:
     def save_progress(self, numsoups, root, symmetry='C1', save_file=True, payosha256_key=None):
 
+        # Census any ashes still waiting in partially-filled buckets:
+        self.flush_ashes()
+
         g.show("Saving progress...")
 
         # Count the total number of objects:
@@ -4049,10 +6223,17 @@ class Soup:
         if not os.path.exists(progresspath):
             os.makedirs(progresspath)
 
+        # Cache statistics are only of local interest, so aren't uploaded:
+        localresults = results + "\n@CACHE_STATISTICS\n"
+        localresults += "objects " + self.cache.statistics() + "\n"
+        localresults += "decompositions " + self.decompositions.statistics() + "\n"
+        localresults += "ashes " + self.ashmemo.statistics() + "\n"
+        localresults += "growth " + self.growthmemo.statistics() + "\n"
+
         filename = progresspath + "search_" + md5root + ".txt"
         try:
             f = open(filename, 'w')
-            f.write(results)
+            f.write(localresults)
             f.close()
         except:
             g.warn("Unable to create progress file:\n" + filename)
@@ -4084,6 +6265,8 @@ class Soup:
     # Display results in Help window:
     def display_census(self, numsoups, root, symmetry):
 
+        self.flush_ashes()
+
         dirname = g.getdir("data")
         separator = dirname[-1]
         apgpath = dirname + "apgsearch" + separator
@@ -4130,46 +6313,7 @@ class Soup:
                 if (objname[0] == 'x'):
                     # save object in rlepath if it doesn't exist (and also in apgcodetorle
                     if not os.path.exists(rlepath):
-                        # Canonised objects are at most 40-by-40:
-                        rledata = "x = 40, y = 40, rule = " + self.rg.slashed + "\n"
-                        # https://ferkeltongs.livejournal.com/15837.html
-                        compact = objname.split('_')[1] + "z"
-                        i = 0
-                        strip = []
-                        while (i < len(compact)):
-                            c = ord2(compact[i])
-                            if (c >= 0):
-                                if (c < 32):
-                                    # Conventional character:
-                                    strip.append(c)
-                                else:
-                                    if (c == 35):
-                                        # End of line:
-                                        if (len(strip) == 0):
-                                            strip.append(0)
-                                        for j in range(5):
-                                            for d in strip:
-                                                if ((d & (1 << j)) > 0):
-                                                    rledata += "o"
-                                                else:
-                                                    rledata += "b"
-                                            rledata += "$\n"
-                                        strip = []
-                                    else:
-                                        # Multispace character:
-                                        strip.append(0)
-                                        strip.append(0)
-                                        if (c >= 33):
-                                            strip.append(0)
-                                        if (c == 34):
-                                            strip.append(0)
-                                            i += 1
-                                            d = ord2(compact[i])
-                                            for j in range(d):
-                                                strip.append(0)
-                            i += 1
-                        # End of pattern representation:
-                        rledata += "!\n"
+                        rledata = cells_to_rle(decode_apgcode(objname), self.rg.slashed)
                         try:
                             f = open(rlepath, 'w')
                             f.write(rledata)
@@ -4215,27 +6359,18 @@ class Soup:
             g.warn("Unable to create html file:\n" + htmlname)
             
 
-# Converts a base-36 case-insensitive alphanumeric character into a
-# numerical value.
-def ord2(char):
-
-    x = ord(char)
-
-    if ((x >= 48) & (x < 58)):
-        return x - 48
-
-    if ((x >= 65) & (x < 91)):
-        return x - 55
-
-    if ((x >= 97) & (x < 123)):
-        return x - 87
+def apg_verify(rulestring, symmetry, payoshakey):
 
-    return -1
+    verifysoup = Soup()
 
+    # As in apg_main(), the soup's resources are released however it ends:
+    try:
+        verify_haul(verifysoup, rulestring, symmetry, payoshakey)
+    finally:
+        verifysoup.close()
 
-def apg_verify(rulestring, symmetry, payoshakey):
+def verify_haul(verifysoup, rulestring, symmetry, payoshakey):
 
-    verifysoup = Soup()
     verifysoup.rg.setrule(rulestring)
     verifysoup.rg.saveAllRules()
 
@@ -4275,6 +6410,8 @@ def apg_verify(rulestring, symmetry, payoshakey):
 
                 pos += (gsize * gsize)
 
+            verifysoup.flush_ashes()
+
             # verifysoup.display_census(-1, "verify", "verify")
 
             payload = "@MD5 "+md5+"\n"
@@ -4293,6 +6430,16 @@ def apg_verify(rulestring, symmetry, payoshakey):
 symmstring = 'C1'
 inflationamount = 0
 def apg_main():
+
+    soup = Soup()
+
+    # Shared memory outlives the script unless it is released:
+    try:
+        apg_search(soup)
+    finally:
+        soup.close()
+
+def apg_search(soup):
     global symmstring
     global inflationamount
     # ---------------- Hardcode the following inputs if running without a user interface ----------------
@@ -4304,6 +6451,32 @@ def apg_main():
     payoshakey = g.getstring("Please enter your key (visit "+get_server_address()+"/payosha256 in your browser).", "#anon")
     # ---------------------------------------------------------------------------------------------------
 
+    # The cache is seeded with every connected still-life and oscillator of
+    # up to seedcells cells and period seedperiod (set seedcells to 0 to
+    # skip this; 8 cells takes a few seconds). The cache file records how
+    # far it has been seeded, so this only happens once per rule:
+    seedcells = 8
+    seedperiod = 4
+
+    # Pseudo-objects of up to seedpseudocells cells which are unions of these
+    # (and of any other known objects) are decomposed in advance too:
+    seedpseudocells = 10
+
+    # Set this to True to share the identification cache, through shared
+    # memory, with other instances searching the same rule on this machine:
+    sharecache = False
+
+    # Number of extra Python processes in which to analyse unidentified
+    # objects (this needs a Python interpreter alongside the library Golly
+    # uses, and is ignored without one):
+    unidworkers = 0
+
+    # The commonest objects listed in previous progress files and downloaded
+    # censuses (see Soup.import_censuses) are also entered into the cache,
+    # up to this many per run. Census files which haven't changed since
+    # they were imported aren't read again:
+    maximported = 2000
+
     # Sanitise input:
     orignumber = max(orignumber, 100000)
     orignumber = min(orignumber, 100000000)
@@ -4318,14 +6491,25 @@ def apg_main():
         g.exit(symmstring+" is not a valid symmetry option")
     quitapg = False
     # Create associated rule tables:
-    soup = Soup()
     soup.pseudo = False
     if symmstring.lower().count('pseudo') > 0:
         #Enable pseudo object recognition if searching a pseudo symmetry.
         soup.pseudo = True
+    soup.unidworkers = unidworkers
+    soup.sharecache = sharecache
     soup.rg.setrule(rulestring)
     soup.rg.saveAllRules()
 
+    # Start with the objects identified by previous runs, and any small
+    # objects they may have missed:
+    soup.load_cache()
+    if (maximported > 0):
+        soup.import_censuses(maximported)
+    if (seedcells > 0):
+        soup.seed_cache(seedcells, seedperiod)
+    if (seedpseudocells > 0):
+        soup.seed_pseudo_objects(seedpseudocells, seedperiod)
+
     # We have 100 soups per page, instead of one. This parallel approach
     # was suggested by Tomas Rokicki, and results in approximately a
     # fourfold increase in soup-searching speed!
@@ -4367,7 +6551,8 @@ def apg_main():
                 
                 g.show(str(scount) + " soups processed (" + str(current_speed) +
                        " per second current; " + str(alltime_speed) + " overall)" +
-                       " : (type 's' to see latest census or 'q' to quit).")
+                       " : (type 's' to see latest census or 'q' to quit)." +
+                       " Cache: " + soup.cache.statistics())
                 
                 event = g.getevent()
                 if event.startswith("key"):
@@ -4421,6 +6606,34 @@ def apg_main():
     soup.display_unids()
     soup.display_census(scount, rootstring, symmstring)
 
+# Seeds the on-disk cache for a rule without searching any soups, so that
+# later searches (on this or any other machine sharing the cache file)
+# start warm. To use this, replace the call to apg_main() at the bottom of
+# the script with a call to seed_main().
+def seed_main():
+
+    rulestring = g.getstring("Which rule to seed the cache for?", "B3/S23")
+    g.setrule(rulestring)
+    rulestring = g.getrule()
+    maxcells = int(g.getstring("Largest still-lifes and oscillators to enumerate (in cells)?", "9"))
+    maxperiod = int(g.getstring("Largest period of oscillators to enumerate?", "4"))
+    maxpseudocells = int(g.getstring("Largest pseudo-objects to decompose (in cells)?", "14"))
+    pseudo = g.getstring("Seed the cache for pseudo-object symmetries? (y/n)", "n")
+
+    soup = Soup()
+    soup.pseudo = pseudo.lower().startswith("y")
+    soup.rg.setrule(rulestring)
+    soup.rg.saveAllRules()
+    try:
+        soup.load_cache()
+        soup.seed_cache(maxcells, maxperiod)
+        soup.seed_pseudo_objects(maxpseudocells, maxperiod)
+        soup.compact_cache()
+    finally:
+        soup.close()
+
+    g.show(str(len(soup.cache)) + " objects in the cache for " + soup.rg.alphanumeric)
+
 def symmetry_test():
 
     g.new("Symmetry test")
@@ -0,0 +1,58 @@
+# main.py is a Golly script: it imports the golly module that Golly
+# provides, and starts a search as soon as it is loaded. These fixtures
+# load it as a module, with a stand-in for the few golly functions that
+# the code under test touches.
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fake_golly(datadir):
+
+    golly = types.ModuleType("golly")
+    golly.getdir = lambda which: datadir + os.sep
+    for name in ["show", "warn", "note", "fit", "update"]:
+        setattr(golly, name, lambda *args: None)
+    return golly
+
+
+@pytest.fixture(scope="session")
+def apgsearch(tmp_path_factory):
+
+    datadir = str(tmp_path_factory.mktemp("golly"))
+    sys.modules["golly"] = fake_golly(datadir)
+
+    with open(os.path.join(ROOT, "main.py")) as f:
+        source = f.read().replace("\napg_main()\n", "\n")
+
+    module = types.ModuleType("apgsearch")
+    exec(compile(source, os.path.join(ROOT, "main.py"), "exec"), module.__dict__)
+    return module
+
+
+# The transition table of Conway's Game of Life, as built by
+# RuleGenerator.transitiontable() in Golly:
+def life_transitions():
+
+    table = []
+    for n in range(512):
+        alive = (n >> 4) & 1
+        neighbours = bin(n).count("1") - alive
+        table.append(1 if ((neighbours == 3) or (alive and (neighbours == 2))) else 0)
+    return table
+
+
+@pytest.fixture
+def soup(apgsearch):
+
+    soup = apgsearch.Soup()
+    soup.rg.alphanumeric = "b3s23"
+    soup.rg.slashed = "B3/S23"
+    soup.rg.transitions = life_transitions()
+    soup.sharecache = False
+    yield soup
+    soup.close()
@@ -0,0 +1,81 @@
+import random
+
+
+def shape_of(apgsearch, livecells):
+
+    rect = apgsearch.list_rect(livecells)
+    return apgsearch.shape_key(livecells, *rect)
+
+
+# Encodes a single still-life phase the way the census names it:
+def encode(apgsearch, livecells):
+
+    return apgsearch.make_apgcode(1, len(livecells) // 2, apgsearch.canonise_cells([livecells]))
+
+
+def round_trip(apgsearch, livecells):
+
+    apgcode = encode(apgsearch, livecells)
+    decoded = apgsearch.decode_apgcode(apgcode)
+
+    assert shape_of(apgsearch, decoded) == shape_of(apgsearch, livecells)
+    assert encode(apgsearch, decoded) == apgcode
+
+    return apgcode
+
+
+def test_strips_round_trip(apgsearch):
+
+    rng = random.Random(3)
+
+    for trial in range(300):
+        strips = []
+        for v in range(rng.randint(1, 4)):
+            strip = []
+            for u in range(rng.randint(1, 120)):
+                # Long runs of empty columns, as well as short ones:
+                strip += [0] * rng.choice([0, 0, 1, 2, 3, 5, 38, 39, 40, 41, 78, 79, 80, 100])
+                strip.append(rng.randint(1, 31))
+            strips.append(strip)
+
+        assert apgsearch.wechsler_to_strips(apgsearch.wechsler_strips(strips)) == strips
+
+
+def test_random_objects_round_trip(apgsearch):
+
+    rng = random.Random(4)
+
+    for trial in range(300):
+        (width, height) = (rng.randint(1, 40), rng.randint(1, 40))
+        cells = set([(rng.randrange(width), rng.randrange(height)) for i in range(rng.randint(1, width * height // 3 + 1))])
+        round_trip(apgsearch, [v for cell in sorted(cells) for v in cell])
+
+
+def test_wide_gaps_round_trip(apgsearch):
+
+    for gap in [38, 39, 40, 41, 45, 79, 80, 81, 200]:
+        # Gaps across a strip, and between strips:
+        apgcode = round_trip(apgsearch, [0, 0, 1, 0, 0, 1, 1, 1, gap + 2, 0, gap + 3, 0, gap + 2, 1, gap + 3, 1])
+        assert (("yz" in apgcode) == (gap >= 39))
+        round_trip(apgsearch, [0, 0, 1, 0, 0, 1, 1, 1, 0, gap + 2, 1, gap + 2, 0, gap + 3, 1, gap + 3])
+
+
+def test_large_objects_round_trip(apgsearch):
+
+    rng = random.Random(5)
+
+    for trial in range(30):
+        (width, height) = (rng.randint(41, 150), rng.randint(41, 150))
+        cells = set([(0, 0), (width - 1, height - 1)])
+        cells |= set([(rng.randrange(width), rng.randrange(height)) for i in range(rng.randint(1, 60))])
+        round_trip(apgsearch, [v for cell in sorted(cells) for v in cell])
+
+
+def test_known_apgcodes(apgsearch):
+
+    assert sorted(zip(*[iter(apgsearch.decode_apgcode("xs4_33"))] * 2)) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert sorted(zip(*[iter(apgsearch.decode_apgcode("xq4_153"))] * 2)) == [(0, 0), (1, 0), (1, 2), (2, 0), (2, 1)]
+    # Two blocks 40 columns apart:
+    assert sorted(zip(*[iter(apgsearch.decode_apgcode("xs8_33yz033"))] * 2)) == [(0, 0), (0, 1), (1, 0), (1, 1), (42, 0), (42, 1), (43, 0), (43, 1)]
+    # A cell and a blinker in the next strip of five rows:
+    assert sorted(zip(*[iter(apgsearch.decode_apgcode("xp2_1zw7"))] * 2)) == [(0, 0), (2, 5), (2, 6), (2, 7)]
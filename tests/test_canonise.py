@@ -0,0 +1,110 @@
+import random
+
+
+# The canoniser which canonise_cells() replaced, reading cells from a set
+# rather than from Golly one at a time:
+def canonise_orientation(cells, length, breadth, ox, oy, a, b, c, d):
+
+    representation = ""
+
+    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+    for v in range(int((breadth-1)/5)+1):
+        zeroes = 0
+        if (v != 0):
+            representation += "z"
+        for u in range(length):
+            baudot = 0
+            for w in range(5):
+                x = ox + a*u + b*(5*v + w)
+                y = oy + c*u + d*(5*v + w)
+                baudot = (baudot >> 1) + 16*((x, y) in cells)
+            if (baudot == 0):
+                zeroes += 1
+            else:
+                if (zeroes > 0):
+                    if (zeroes == 1):
+                        representation += "0"
+                    elif (zeroes == 2):
+                        representation += "w"
+                    elif (zeroes == 3):
+                        representation += "x"
+                    else:
+                        representation += "y"
+                        representation += chars[zeroes - 4]
+                zeroes = 0
+                representation += chars[baudot]
+    return representation
+
+
+def old_canonise(apgsearch, phases):
+
+    representation = "#"
+
+    for celllist in phases:
+
+        cells = set(zip(celllist[0::2], celllist[1::2]))
+        rect = apgsearch.list_rect(celllist)
+
+        if ((rect[2] <= 40) & (rect[3] <= 40)):
+            for (length, breadth, ox, oy, a, b, c, d) in [
+                    (rect[2], rect[3], rect[0], rect[1], 1, 0, 0, 1),
+                    (rect[2], rect[3], rect[0]+rect[2]-1, rect[1], -1, 0, 0, 1),
+                    (rect[2], rect[3], rect[0], rect[1]+rect[3]-1, 1, 0, 0, -1),
+                    (rect[2], rect[3], rect[0]+rect[2]-1, rect[1]+rect[3]-1, -1, 0, 0, -1),
+                    (rect[3], rect[2], rect[0], rect[1], 0, 1, 1, 0),
+                    (rect[3], rect[2], rect[0]+rect[2]-1, rect[1], 0, -1, 1, 0),
+                    (rect[3], rect[2], rect[0], rect[1]+rect[3]-1, 0, 1, -1, 0),
+                    (rect[3], rect[2], rect[0]+rect[2]-1, rect[1]+rect[3]-1, 0, -1, -1, 0)]:
+                representation = apgsearch.compare_representations(representation,
+                    canonise_orientation(cells, length, breadth, ox, oy, a, b, c, d))
+
+    return representation
+
+
+def random_phase(rng, maxsize):
+
+    width = rng.randint(1, maxsize)
+    height = rng.randint(1, maxsize)
+    density = rng.choice([0.02, 0.1, 0.4, 0.8])
+    (dx, dy) = (rng.randint(-50, 50), rng.randint(-50, 50))
+
+    cells = set()
+    for i in range(max(1, int(width * height * density))):
+        cells.add((rng.randrange(width) + dx, rng.randrange(height) + dy))
+
+    return [v for cell in sorted(cells) for v in cell]
+
+
+def test_matches_old_canoniser(apgsearch):
+
+    rng = random.Random(1)
+
+    for trial in range(400):
+        phases = [random_phase(rng, 40) for i in range(rng.choice([1, 1, 2, 3]))]
+        assert apgsearch.canonise_cells(phases) == old_canonise(apgsearch, phases)
+
+
+def test_ignores_oversized_phases(apgsearch):
+
+    rng = random.Random(2)
+
+    for trial in range(60):
+        phases = [random_phase(rng, 40), random_phase(rng, 60), random_phase(rng, 40)]
+        if (old_canonise(apgsearch, phases) != "#"):
+            assert apgsearch.canonise_cells(phases) == old_canonise(apgsearch, phases)
+
+
+def test_known_objects(apgsearch, soup):
+
+    transitions = soup.rg.transitiontable()
+
+    for apgcode in ["xs4_33", "xp2_7", "xq4_153", "xp15_4r4z4r4", "xs6_696"]:
+        period = abs(apgsearch.apgcode_period(apgcode))
+        cells = set(zip(*[iter(apgsearch.decode_apgcode(apgcode))] * 2))
+        phases = []
+        for t in range(period):
+            phases.append(apgsearch.cell_list(cells))
+            cells = apgsearch.evolve(cells, transitions)
+
+        assert apgsearch.canonise_cells(phases) == apgcode.split("_")[1]
@@ -0,0 +1,37 @@
+def rollback(apgsearch, soup, monkeypatch, soupids):
+
+    for name in ["new", "setalgo", "putcells"]:
+        monkeypatch.setattr(apgsearch.g, name, lambda *args: None, raising=False)
+    monkeypatch.setattr(soup, "census", lambda stepsize: {})
+
+    soup.rollback_soups([[soupid, [0, 0], [0, 0, 1, 1], 3] for soupid in soupids], 16, 3)
+
+
+def test_rollback_readmits_refused_soups(apgsearch, soup, monkeypatch):
+
+    for soupid in range(12):
+        soup.awardpoints2(soupid, "xs4_33")
+    assert soup.alloccur["xs4_33"] == list(range(10))
+
+    rollback(apgsearch, soup, monkeypatch, [3])
+
+    # As if soup 3 had never been counted:
+    assert soup.alloccur["xs4_33"] == [0, 1, 2, 4, 5, 6, 7, 8, 9, 10]
+
+    # The readmitted soup can itself be rolled back:
+    rollback(apgsearch, soup, monkeypatch, [10])
+
+    assert soup.alloccur["xs4_33"] == [0, 1, 2, 4, 5, 6, 7, 8, 9, 11]
+
+
+def test_rollback_restores_scores(apgsearch, soup, monkeypatch):
+
+    for soupid in range(3):
+        soup.awardpoints2(soupid, "xp15_4r4z4r4")
+    scores = dict(soup.soupscores)
+
+    soup.awardpoints2(7, "xp15_4r4z4r4")
+    rollback(apgsearch, soup, monkeypatch, [7])
+
+    assert soup.soupscores == scores
+    assert soup.alloccur["xp15_4r4z4r4"] == [0, 1, 2]
@@ -0,0 +1,87 @@
+import math
+
+
+# A growth pattern stepped by a stand-in for Golly, whose population in the
+# i-th step is population(i):
+class SteppedPattern:
+
+    def __init__(self, population):
+
+        self.population = population
+        self.steps = 0
+
+    def step(self):
+
+        self.steps += 1
+
+    def getpop(self):
+
+        return str(self.population(self.steps))
+
+
+def run_powerlyse(apgsearch, monkeypatch, population, numsteps):
+
+    pattern = SteppedPattern(population)
+    monkeypatch.setattr(apgsearch.g, "step", pattern.step, raising=False)
+    monkeypatch.setattr(apgsearch.g, "getpop", pattern.getpop, raising=False)
+    for name in ["setalgo", "setbase", "setstep"]:
+        monkeypatch.setattr(apgsearch.g, name, lambda *args: None, raising=False)
+    return (apgsearch.powerlyse(8, numsteps), pattern.steps)
+
+
+# The class the exponent of the later half of the cumulative populations
+# falls in:
+def baseline_class(apgsearch, population, numsteps):
+
+    total = population(0)
+    pointlist = []
+    for i in range(1, numsteps):
+        total += population(i)
+        if (i > numsteps / 2):
+            pointlist.append((math.log(i), math.log(total + 1.0)))
+    return apgsearch.power_class(apgsearch.regress(pointlist))
+
+
+def test_late_acceleration_keeps_baseline_class(apgsearch, monkeypatch):
+
+    # Linear growth for the first 600 steps, then quadratic:
+    population = lambda i: i if (i < 600) else i + (i - 600) ** 2 // 4
+
+    (descriptor, steps) = run_powerlyse(apgsearch, monkeypatch, population, 1500)
+
+    assert descriptor == baseline_class(apgsearch, population, 1500)
+    assert descriptor == "zz_QUADRATIC"
+    assert steps == 1499
+
+
+def test_linear_growth_stops_early(apgsearch, monkeypatch):
+
+    population = lambda i: 5 * i + 20
+
+    (descriptor, steps) = run_powerlyse(apgsearch, monkeypatch, population, 1500)
+
+    assert descriptor == baseline_class(apgsearch, population, 1500)
+    assert descriptor == "zz_LINEAR"
+    assert steps < 1000
+
+
+def test_quadratic_growth_stops_early(apgsearch, monkeypatch):
+
+    population = lambda i: i * i // 8 + 3
+
+    (descriptor, steps) = run_powerlyse(apgsearch, monkeypatch, population, 1500)
+
+    assert descriptor == baseline_class(apgsearch, population, 1500)
+    assert descriptor == "zz_QUADRATIC"
+    assert steps < 1000
+
+
+def test_slowing_growth_keeps_baseline_class(apgsearch, monkeypatch):
+
+    # Quadratic growth which levels off to linear growth after 250 steps:
+    population = lambda i: i * i // 8 if (i < 250) else 7800 + 60 * (i - 250)
+
+    (descriptor, steps) = run_powerlyse(apgsearch, monkeypatch, population, 1500)
+
+    assert descriptor == baseline_class(apgsearch, population, 1500)
+    assert steps == 1499
@@ -0,0 +1,44 @@
+import pytest
+
+
+def test_seeding_is_recorded_in_cache_file(apgsearch, soup, tmp_path, monkeypatch):
+
+    soup.cachedir = str(tmp_path)
+    soup.load_cache()
+    soup.setcache((2, 2, 15), "xs4_33")
+    soup.mark_seeded("s", 8, 4)
+
+    restarted = apgsearch.Soup()
+    restarted.rg.alphanumeric = soup.rg.alphanumeric
+    restarted.rg.transitions = soup.rg.transitions
+    restarted.cachedir = str(tmp_path)
+    restarted.load_cache()
+
+    def enumerate_polyplets(maxcells):
+        raise AssertionError("seeded again")
+
+    monkeypatch.setattr(apgsearch, "enumerate_polyplets", enumerate_polyplets)
+
+    # Seeding as far as before, or less far, is skipped:
+    restarted.seed_cache(8, 4)
+    restarted.seed_cache(7, 2)
+    assert restarted.cache.get((2, 2, 15)) == "xs4_33"
+
+    # Seeding further is not:
+    with pytest.raises(AssertionError):
+        restarted.seed_cache(9, 4)
+
+    restarted.close()
+
+
+def test_compaction_keeps_latest_seeding(apgsearch, soup, tmp_path):
+
+    soup.cachedir = str(tmp_path)
+    soup.load_cache()
+    soup.mark_seeded("s", 6, 2)
+    soup.mark_seeded("s", 8, 4)
+    soup.mark_seeded("p", 10, 4)
+    soup.compact_cache()
+
+    with open(soup.cachepath()) as f:
+        assert f.read() == "s 8 4\np 10 4\n"
@@ -0,0 +1,64 @@
+import random
+import time
+
+
+# The cells of a pattern in each of the eight orientations, translated:
+def orientations(apgsearch, livecells):
+
+    for (a, b, c, d) in apgsearch.orientations:
+        cells = []
+        for i in range(0, len(livecells), 2):
+            (x, y) = (livecells[i], livecells[i+1])
+            cells += [a*x + b*y + 17, c*x + d*y - 5]
+        yield cells
+
+
+def shape_keys(apgsearch, livecells):
+
+    return set([apgsearch.shape_key(cells, *apgsearch.list_rect(cells)) for cells in orientations(apgsearch, livecells)])
+
+
+def sparse_pattern(seed, size, population):
+
+    rng = random.Random(seed)
+    cells = [0, 0, size - 1, size // 3]
+    for i in range(population):
+        cells += [rng.randrange(size), rng.randrange(size)]
+    return cells
+
+
+def test_small_keys_ignore_orientation(apgsearch):
+
+    livecells = apgsearch.decode_apgcode("xq4_153")
+
+    assert len(shape_keys(apgsearch, livecells)) == 1
+
+
+def test_large_keys_ignore_orientation(apgsearch):
+
+    livecells = sparse_pattern(1, 1000, 300)
+    keys = shape_keys(apgsearch, livecells)
+
+    assert len(keys) == 1
+    (width, height, digest) = keys.pop()
+    assert (width * height > apgsearch.maxbitmaparea) and (digest < 2 ** 128)
+
+
+def test_large_keys_tell_patterns_apart(apgsearch):
+
+    first = sparse_pattern(1, 1000, 300)
+    second = list(first)
+    second[-1] = (second[-1] + 1) % 1000
+
+    assert shape_keys(apgsearch, first) != shape_keys(apgsearch, second)
+
+
+def test_large_keys_are_cheap(apgsearch):
+
+    livecells = sparse_pattern(2, 4000, 1000)
+    rect = apgsearch.list_rect(livecells)
+
+    start = time.time()
+    apgsearch.shape_key(livecells, *rect)
+
+    assert time.time() - start < 0.1
@@ -0,0 +1,89 @@
+import pytest
+
+from conftest import life_transitions
+
+
+def sharing_soup(apgsearch, cachedir):
+
+    soup = apgsearch.Soup()
+    soup.rg.alphanumeric = "b3s23"
+    soup.rg.slashed = "B3/S23"
+    soup.rg.transitions = life_transitions()
+    soup.cachedir = str(cachedir)
+    soup.sharecache = True
+    soup.load_cache()
+    return soup
+
+
+@pytest.fixture
+def soups(apgsearch, tmp_path, monkeypatch):
+
+    if apgsearch.shared_memory is None:
+        pytest.skip("shared memory needs Python 3.8")
+
+    registered = []
+    monkeypatch.setattr(apgsearch.resource_tracker, "register", lambda *args: registered.append(args))
+
+    writer = sharing_soup(apgsearch, tmp_path)
+    reader = sharing_soup(apgsearch, tmp_path)
+    yield (writer, reader)
+    reader.close()
+    writer.close()
+
+    # Nothing may start the resource tracker, which inside Golly would be
+    # another copy of Golly:
+    assert registered == []
+
+
+def test_reader_sees_writer_entries(soups):
+
+    (writer, reader) = soups
+    assert writer.sharedcache.writer
+    assert not reader.sharedcache.writer
+
+    writer.setcache((2, 2, 15), "xs4_33")
+    writer.save_cache()
+    writer.sync_shared_cache()
+
+    assert reader.cache.get((2, 2, 15)) == "xs4_33"
+
+
+def test_writer_publishes_reader_entries(soups):
+
+    (writer, reader) = soups
+
+    reader.setcache((3, 1, 7), "xp2_7")
+    reader.setdecomposition("xs8_6996", ["xs4_33", "xs4_33"])
+    reader.save_cache()
+    writer.sync_shared_cache()
+
+    assert writer.shared_object((3, 1, 7)) == "xp2_7"
+    assert writer.shared_decomposition("xs8_6996") == ["xs4_33", "xs4_33"]
+
+
+def test_torn_slot_reads_as_missing(soups):
+
+    (writer, reader) = soups
+
+    writer.setcache((2, 2, 15), "xs4_33")
+    writer.save_cache()
+    writer.sync_shared_cache()
+
+    # A reader which sees the slot before the value it names (as it may on
+    # weakly ordered processors) must not return what it finds there:
+    table = writer.sharedcache
+    start = table.area + table.interned["xs4_33"] - 1
+    table.shm.buf[start + 2:start + 8] = b"\0" * 6
+
+    assert reader.shared_object((2, 2, 15)) is None
+
+
+def test_writer_removes_table(apgsearch, soups):
+
+    (writer, reader) = soups
+    name = writer.sharedcache.shm.name
+
+    writer.close()
+
+    with pytest.raises(FileNotFoundError):
+        apgsearch.untracked_shared_memory(name, False, 0)
@@ -0,0 +1,105 @@
+import os
+import signal
+import time
+
+from conftest import life_transitions
+
+APGCODES = ["xs4_33", "xp2_7", "xq7_3nw17862z6952", "xs6_696", "xp15_4r4z4r4"]
+
+GOSPER_GUN = [(24, 0), (22, 1), (24, 1), (12, 2), (13, 2), (20, 2), (21, 2), (34, 2), (35, 2),
+              (11, 3), (15, 3), (20, 3), (21, 3), (34, 3), (35, 3), (0, 4), (1, 4), (10, 4),
+              (16, 4), (20, 4), (21, 4), (0, 5), (1, 5), (10, 5), (14, 5), (16, 5), (17, 5),
+              (22, 5), (24, 5), (10, 6), (16, 6), (24, 6), (11, 7), (15, 7), (12, 8), (13, 8)]
+
+
+def make_unids(apgsearch):
+
+    unids = []
+    for apgcode in APGCODES:
+        livecells = [v + 100 for v in apgsearch.decode_apgcode(apgcode)]
+        rect = apgsearch.list_rect(livecells)
+        unids.append((apgsearch.shape_key(livecells, *rect), livecells, rect[0], rect[1]))
+    return unids
+
+
+def test_workers_identify_objects(apgsearch, soup):
+
+    soup.unidworkers = 2
+    unids = make_unids(apgsearch)
+
+    results = soup.identify_unids(unids)
+
+    names = [apgsearch.make_apgcode(result[0], len(unid[1]) // 2, result[1]) for (unid, result) in zip(unids, results)]
+    assert names == APGCODES
+
+
+def test_workers_stop_on_close(soup, apgsearch):
+
+    soup.unidworkers = 1
+    soup.identify_unids(make_unids(apgsearch))
+    workers = soup.unidpool[2]
+
+    soup.close()
+
+    assert soup.unidpool is None
+    assert all([worker.poll() is not None for worker in workers])
+
+
+def test_dead_worker_leaves_objects_to_batch(soup, apgsearch, monkeypatch):
+
+    soup.unidworkers = 1
+    unids = make_unids(apgsearch)
+    soup.identify_unids(unids)
+    worker = soup.unidpool[2][0]
+    os.kill(worker.pid, signal.SIGKILL)
+    worker.wait()
+
+    batches = []
+    monkeypatch.setattr(soup, "batch_bijoscar", lambda celllists: batches.append(celllists) or [None] * len(celllists))
+
+    start = time.time()
+    results = soup.identify_unids(unids)
+
+    assert results == [None] * len(unids)
+    assert batches == [[unid[1] for unid in unids]]
+    assert soup.unidpool is None
+    assert time.time() - start < 10
+
+    # The next page starts a fresh pool:
+    assert soup.identify_unids(unids)[0] is not None
+
+
+def test_workers_return_growth_populations(soup, apgsearch):
+
+    soup.unidworkers = 2
+    gun = [v for cell in GOSPER_GUN for v in cell]
+    unids = make_unids(apgsearch)[:1] + [(apgsearch.shape_key(gun, *apgsearch.list_rect(gun)), gun, 0, 0)]
+
+    results = soup.identify_unids(unids)
+
+    # Golly is left only to analyse the growth:
+    (period, canonised, populations) = results[1]
+    assert (period, canonised) == (-1, None)
+    assert len(populations) == 1000
+    assert populations[-1] > populations[0]
+
+    cells = set(GOSPER_GUN)
+    for population in populations[:60]:
+        cells = apgsearch.evolve(cells, life_transitions())
+        assert population == len(cells)
+
+
+def test_unstartable_workers_leave_objects_to_batch(soup, apgsearch, monkeypatch):
+
+    # As when the interpreter found is of another version of Python:
+    monkeypatch.setattr(apgsearch, "unidworkerprogram", "import sys; sys.exit(1)")
+    batches = []
+    monkeypatch.setattr(soup, "batch_bijoscar", lambda celllists: batches.append(celllists) or [None] * len(celllists))
+
+    soup.unidworkers = 2
+    unids = make_unids(apgsearch)
+    soup.identify_unids(unids)
+
+    assert soup.unidworkers == 0
+    assert soup.unidpool is None
+    assert batches == [[unid[1] for unid in unids]]